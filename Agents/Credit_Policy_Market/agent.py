@@ -14,13 +14,13 @@ from dotenv import load_dotenv
 from agno.models.groq import Groq
 from agno.tools.thinking import ThinkingTools
 from agno.tools.tavily import TavilyTools
-from Tools.market_inform_policy_capture import MarketInformPolicyCapture
+from Tools.market_inform_policy_capture import get_market_intelligence_refresher
 
 load_dotenv()
 
 class CreditPolicyMarketAgent:
     def __init__(self, model_id = "gemini-2.0-flash"):
-        self.market_capture_tool = MarketInformPolicyCapture()
+        self.market_capture_tool = get_market_intelligence_refresher()
         if model_id == "gemini-2.0-flash":
             self.agent = Agent(
                 model=Gemini(id="gemini-2.0-flash"), 
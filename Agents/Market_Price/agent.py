@@ -16,6 +16,7 @@ sys.path.append(parent_dir)
 sys.path.append(project_root)
 
 from Tools.fetchMarketPrice import fetch_market_price
+from Tools.mandi_price_analytics import analyze_mandi_arbitrage
 from agno.tools.tavily import TavilyTools
 
 
@@ -26,7 +27,7 @@ class MarketPriceAgent:
         if model_id == "gemini-2.0-flash":
             self.agent = Agent(
                 model=Gemini(id=model_id),
-                tools=[TavilyTools(), fetch_market_price],
+                tools=[TavilyTools(), fetch_market_price, analyze_mandi_arbitrage],
                 show_tool_calls=True,
                 markdown=True,
             add_history_to_messages=True,
@@ -40,6 +41,7 @@ class MarketPriceAgent:
    - Monitor prices across different states and agricultural regions in India
    - Track mandi rates for wheat, rice, cotton, soybean, maize, sugarcane, pulses
    - Compare prices between different mandis and identify arbitrage opportunities
+   - Use analyze_mandi_arbitrage for price spreads, day-over-day changes and arbitrage pairs instead of computing them from raw fetch_market_price rows
 
 2. **Indian Agricultural Analysis**:
    - Analyze monsoon impact on crop production and prices
@@ -121,7 +123,7 @@ When using search tools, focus on Indian sources:
         else:
             self.agent = Agent(
                 model=Groq(id=model_id),
-                tools=[TavilyTools(), fetch_market_price],
+                tools=[TavilyTools(), fetch_market_price, analyze_mandi_arbitrage],
                 show_tool_calls=True,
                 markdown=True,
                 add_history_to_messages=True,
@@ -135,6 +137,7 @@ When using search tools, focus on Indian sources:
    - Monitor prices across different states and agricultural regions in India
    - Track mandi rates for wheat, rice, cotton, soybean, maize, sugarcane, pulses
    - Compare prices between different mandis and identify arbitrage opportunities
+   - Use analyze_mandi_arbitrage for price spreads, day-over-day changes and arbitrage pairs instead of computing them from raw fetch_market_price rows
 
 2. **Indian Agricultural Analysis**:
    - Analyze monsoon impact on crop production and prices
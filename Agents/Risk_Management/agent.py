@@ -13,7 +13,7 @@ from agno.models.groq import Groq
 from dotenv import load_dotenv
 from agno.tools.tavily import TavilyTools
 from agno.tools.googlesearch import GoogleSearchTools
-from Tools.risk_management import get_agricultural_risk_metrics
+from Tools.risk_management import get_agricultural_risk_metrics, get_portfolio_risk_metrics, get_risk_scenario_simulation
 
 load_dotenv()
 
@@ -22,7 +22,7 @@ class AgriculturalRiskAnalysisAgent:
         if model_id == "gemini-2.0-flash":
             self.agent = Agent(
                 model=Gemini(id="gemini-2.0-flash"),
-                tools=[get_agricultural_risk_metrics, TavilyTools(), GoogleSearchTools()],
+                tools=[get_agricultural_risk_metrics, get_portfolio_risk_metrics, get_risk_scenario_simulation, TavilyTools(), GoogleSearchTools()],
                 add_history_to_messages=True,
                 num_history_responses=5,
                 instructions="""
@@ -32,6 +32,7 @@ RISK ANALYSIS FRAMEWORK:
 - Begin by identifying the commodity, region, and time horizon for risk assessment.
 - Collect and analyze market data, weather data, and credit data relevant to the query.
 - Use agricultural_risk_assessment to quantify risk metrics including weather risk, market volatility, credit risk, operational risk, and portfolio risk.
+- Use get_risk_scenario_simulation when a credit decision needs a risk distribution: report VaR/CVaR and the probability of High or Critical risk rather than a single score.
 - Evaluate drought probability, flood risk, climate stress, crop vulnerability, price volatility, liquidity risk, tail risk, default probability, and supply chain risk.
 - Assess risk exposures across sectors, geographies, and crop types.
 - Run stress test scenarios for severe drought, commodity price crash, interest rate surge, supply chain disruption, and regulatory changes.
@@ -61,7 +62,7 @@ OUTPUT REQUIREMENTS:
         else:
             self.agent = Agent(
                 model=Groq(id=model_id),
-                tools=[get_agricultural_risk_metrics, TavilyTools(), GoogleSearchTools()],
+                tools=[get_agricultural_risk_metrics, get_portfolio_risk_metrics, get_risk_scenario_simulation, TavilyTools(), GoogleSearchTools()],
                 add_history_to_messages=True,
                 num_history_responses=5,
                 instructions="""
@@ -71,6 +72,7 @@ RISK ANALYSIS FRAMEWORK:
 - Begin by identifying the commodity, region, and time horizon for risk assessment.
 - Collect and analyze market data, weather data, and credit data relevant to the query.
 - Use agricultural_risk_assessment to quantify risk metrics including weather risk, market volatility, credit risk, operational risk, and portfolio risk.
+- Use get_risk_scenario_simulation when a credit decision needs a risk distribution: report VaR/CVaR and the probability of High or Critical risk rather than a single score.
 - Evaluate drought probability, flood risk, climate stress, crop vulnerability, price volatility, liquidity risk, tail risk, default probability, and supply chain risk.
 - Assess risk exposures across sectors, geographies, and crop types.
 - Run stress test scenarios for severe drought, commodity price crash, interest rate surge, supply chain disruption, and regulatory changes.
@@ -1,10 +1,11 @@
 import os
+import re
 import sys
 import asyncio
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 import logging
 
@@ -23,10 +24,68 @@ from Tools.pest_prediction import detect_pests
 from Tools.risk_management import get_agricultural_risk_metrics
 from dotenv import load_dotenv
 
+try:
+    from Deep_Research.research_cache import get_research_cache
+except ImportError:
+    from research_cache import get_research_cache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+QUERY_FILLERS = {
+    "latest", "research", "best", "practices", "case", "studies", "technology", "solutions",
+    "agricultural", "agriculture", "the", "a", "an", "of", "in", "on", "for", "and", "to", "with", "by", "about"
+}
+
+AGENT_SPECIALTIES = {
+    "arxiv": ["research", "study", "studies", "paper", "model", "method", "experiment", "trial", "genetic",
+              "genomic", "breeding", "remote sensing", "machine learning", "simulation", "analysis"],
+    "wikipedia": ["what is", "definition", "overview", "history", "background", "basics", "fundamental",
+                  "concept", "introduction", "types of", "classification"],
+    "tavily": ["latest", "current", "recent", "news", "market", "price", "policy", "scheme", "subsidy",
+               "regulation", "trend", "forecast", "weather", "best practices", "case studies", "technology"]
+}
+
+# Whole-word matches only, so "industrial" does not count as "trial" nor "supermarket" as "market"
+AGENT_PATTERNS = {
+    agent_name: [re.compile(rf'\b{re.escape(keyword)}\b') for keyword in keywords]
+    for agent_name, keywords in AGENT_SPECIALTIES.items()
+}
+
+SOURCE_PATTERN = re.compile(r'https?://[^\s)\]>"\']+|\b10\.\d{4,9}/[^\s)\]>"\']+', re.IGNORECASE)
+
+def normalize_query(query: str) -> frozenset:
+    tokens = re.findall(r'[a-z0-9]+', query.lower())
+    return frozenset(token for token in tokens if token not in QUERY_FILLERS) or frozenset(tokens)
+
+def cluster_queries(queries: List[str], threshold: float = 0.75) -> List[List[str]]:
+    clusters: List[Tuple[frozenset, List[str]]] = []
+    for query in queries:
+        tokens = normalize_query(query)
+        for cluster_tokens, members in clusters:
+            union = tokens | cluster_tokens
+            if union and len(tokens & cluster_tokens) / len(union) >= threshold:
+                members.append(query)
+                break
+        else:
+            clusters.append((tokens, [query]))
+    return [members for _, members in clusters]
+
+def route_query(query: str, available: List[str], max_agents: int = 2,
+                default: Tuple[str, ...] = ("tavily", "arxiv")) -> List[str]:
+    text = query.lower()
+    scores = {
+        agent_name: sum(1 for pattern in AGENT_PATTERNS.get(agent_name, []) if pattern.search(text))
+        for agent_name in available
+    }
+    matched = sorted((name for name, score in scores.items() if score > 0), key=lambda name: -scores[name])
+    routed = matched[:max_agents] or [name for name in default if name in available] or list(available)[:1]
+    return routed
+
+def extract_source_keys(content: str) -> set:
+    return {match.rstrip('.,;').lower() for match in SOURCE_PATTERN.findall(content or "")}
+
 @dataclass
 class SearchResult:
     agent_name: str
@@ -36,12 +95,22 @@ class SearchResult:
     execution_time: float
     sources_found: int = 0
     error_message: Optional[str] = None
+    cached: bool = False
 
 class EnhancedSubsearchAgent:
     def __init__(self, max_workers: int = 3):
         self.max_workers = max_workers
         self.agents = self._initialize_agents()
         
+        self.llm_concurrency = int(os.getenv("SUBSEARCH_LLM_CONCURRENCY", 6))
+        self.llm_slots = threading.BoundedSemaphore(self.llm_concurrency)
+        self.agent_slots = {
+            agent_name: threading.BoundedSemaphore(int(os.getenv(f"SUBSEARCH_{agent_name.upper()}_CONCURRENCY", 3)))
+            for agent_name in self.agents
+        }
+        self.max_agents_per_query = int(os.getenv("SUBSEARCH_MAX_AGENTS_PER_QUERY", 2))
+        self.target_sources = int(os.getenv("SUBSEARCH_TARGET_SOURCES", 12))
+        
     def _initialize_agents(self) -> Dict[str, Agent]:
         common_tools = [
             get_google_weather_forecast, 
@@ -102,7 +171,23 @@ class EnhancedSubsearchAgent:
         
         return agents
 
-    def _execute_single_search(self, agent_name: str, query: str, context: Optional[str] = None) -> SearchResult:
+    def _execute_single_search(self, agent_name: str, query: str, context: Optional[str] = None,
+                               force_refresh: bool = False) -> SearchResult:
+        # The context is part of the prompt, so it is part of the key as well
+        cache = get_research_cache()
+        if not force_refresh:
+            cached = cache.get(f"search:{agent_name}", query, context or "")
+            if cached:
+                return SearchResult(**{**cached, "cached": True})
+        
+        with self.agent_slots[agent_name], self.llm_slots:
+            result = self._run_search(agent_name, query, context)
+        
+        if result.success:
+            cache.put(f"search:{agent_name}", asdict(result), query, context or "")
+        return result
+
+    def _run_search(self, agent_name: str, query: str, context: Optional[str] = None) -> SearchResult:
         start_time = datetime.now()
         agent = self.agents[agent_name]
         
@@ -159,41 +244,76 @@ class EnhancedSubsearchAgent:
         source_indicators = ['http', 'doi:', 'source:', 'reference:', 'cited', 'published']
         return sum(1 for indicator in source_indicators if indicator.lower() in content.lower())
 
-    def search_parallel(self, queries: List[str], context: Optional[str] = None) -> List[SearchResult]:
+    def plan_searches(self, queries: List[str]) -> List[Tuple[str, str]]:
+        clusters = cluster_queries(queries)
+        routes = []
+        for members in clusters:
+            representative = max(members, key=len)
+            routes.append((representative, route_query(" ".join(members), list(self.agents), self.max_agents_per_query)))
+        
+        # Primary specialists for every cluster go first, so an early stop only drops secondary fan-out
+        plan = []
+        for rank in range(max((len(agents) for _, agents in routes), default=0)):
+            plan.extend((agents[rank], query) for query, agents in routes if rank < len(agents))
+        
+        logger.info(f"Planned {len(plan)} searches for {len(queries)} queries in {len(clusters)} clusters "
+                    f"(full fan-out would be {len(queries) * len(self.agents)})")
+        return plan
+
+    def search_parallel(self, queries: List[str], context: Optional[str] = None,
+                        target_sources: Optional[int] = None, force_refresh: bool = False) -> List[SearchResult]:
         all_results = []
+        target_sources = self.target_sources if target_sources is None else target_sources
+        sources_seen = set()
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = []
-            
-            for query in queries:
-                for agent_name in self.agents.keys():
-                    future = executor.submit(self._execute_single_search, agent_name, query, context)
-                    futures.append(future)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        timed_out = False
+        try:
+            pending = {
+                executor.submit(self._execute_single_search, agent_name, query, context, force_refresh)
+                for agent_name, query in self.plan_searches(queries)
+            }
             
-            for future in as_completed(futures):
-                try:
-                    result = future.result(timeout=120)
-                    all_results.append(result)
-                    logger.info(f"Completed search: {result.agent_name} - {result.query[:50]}...")
-                except Exception as e:
-                    logger.error(f"Future execution failed: {str(e)}")
+            while pending:
+                done, pending = wait(pending, timeout=120, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.error(f"{len(pending)} searches timed out")
+                    timed_out = True
+                    break
+                
+                for future in done:
+                    try:
+                        result = future.result()
+                        all_results.append(result)
+                        if result.success:
+                            sources_seen |= extract_source_keys(result.content)
+                        logger.info(f"Completed search: {result.agent_name} - {result.query[:50]}...")
+                    except Exception as e:
+                        logger.error(f"Future execution failed: {str(e)}")
+                
+                if target_sources and len(sources_seen) >= target_sources and pending:
+                    cancelled = sum(1 for future in pending if future.cancel())
+                    pending = {future for future in pending if not future.cancelled()}
+                    if cancelled:
+                        logger.info(f"Found {len(sources_seen)} distinct sources, skipped {cancelled} queued searches")
+        finally:
+            # Leaving a with-block would join the threads still stuck on timed-out searches
+            executor.shutdown(wait=not timed_out, cancel_futures=True)
         
         return all_results
 
     def search_sequential(self, queries: List[str], context: Optional[str] = None) -> List[SearchResult]:
         all_results = []
         
-        for query in queries:
-            logger.info(f"Processing query: {query}")
+        for agent_name, query in self.plan_searches(queries):
+            logger.info(f"Processing query with {agent_name}: {query}")
+            result = self._execute_single_search(agent_name, query, context)
+            all_results.append(result)
             
-            for agent_name in self.agents.keys():
-                result = self._execute_single_search(agent_name, query, context)
-                all_results.append(result)
-                
-                if result.success:
-                    logger.info(f"Success {agent_name}: Found {result.sources_found} sources")
-                else:
-                    logger.warning(f"Failed {agent_name}: Search failed")
+            if result.success:
+                logger.info(f"Success {agent_name}: Found {result.sources_found} sources")
+            else:
+                logger.warning(f"Failed {agent_name}: Search failed")
         
         return all_results
 
@@ -209,7 +329,10 @@ class EnhancedSubsearchAgent:
             approach = "sequential_execution"
         
         total_time = (datetime.now() - start_time).total_seconds()
-        
+        return self.summarize_results(results, len(queries), total_time, approach)
+
+    def summarize_results(self, results: List[SearchResult], queries_processed: int,
+                          total_time: float, approach: str) -> Dict[str, Any]:
         successful_results = [r for r in results if r.success]
         failed_results = [r for r in results if not r.success]
         
@@ -219,9 +342,10 @@ class EnhancedSubsearchAgent:
             "success": len(successful_results) > 0,
             "approach": approach,
             "total_execution_time": total_time,
-            "queries_processed": len(queries),
+            "queries_processed": queries_processed,
             "successful_searches": len(successful_results),
             "failed_searches": len(failed_results),
+            "cached_searches": sum(1 for r in successful_results if r.cached),
             "total_sources_found": sum(r.sources_found for r in successful_results),
             "combined_content": combined_content,
             "detailed_results": successful_results,
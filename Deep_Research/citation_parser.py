@@ -0,0 +1,182 @@
+import re
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+@dataclass
+class Citation:
+    title: str
+    authors: str
+    journal: str
+    year: str
+    url: str
+    source_type: str
+    relevance: int
+    doi: Optional[str] = None
+    abstract: Optional[str] = None
+    keywords: List[str] = None
+
+    def to_apa(self) -> str:
+        return f"{self.authors} ({self.year}). {self.title}. {self.journal}."
+
+MIN_SECTION_LENGTH = 50
+
+LEADING_YEAR = re.compile(r'\d{4}')
+LEADING_NUMBER = re.compile(r'\d+')
+LEADING_URL = re.compile(r'https?://\S+')
+DOI_PATTERN = re.compile(r'\b(10\.\d{4,9}/[^\s"<>]+)', re.IGNORECASE)
+
+# Lower rank wins when a section carries the same field in several forms
+LABEL_FIELDS = [
+    ('Title', 'title', 0), ('Authors', 'authors', 0), ('Author', 'authors', 0),
+    ('Journal', 'journal', 0), ('Source', 'journal', 1), ('Year', 'year', 0),
+    ('URL', 'url', 0), ('DOI', 'url', 1), ('Link', 'url', 2),
+    ('Relevance', 'relevance', 0), ('Type', 'source_type', 0), ('Abstract', 'abstract', 0)
+]
+BOLD_FIELDS = [
+    ('Title', 'title', 1), ('Authors', 'authors', 1), ('Author', 'authors', 1),
+    ('Journal', 'journal', 2), ('Year', 'year', 1)
+]
+HEADING_RANK = 2
+PAREN_YEAR_RANK = 2
+BARE_URL_RANK = 3
+
+# One scanner for the whole response. Each branch opens with a literal so the regex engine keeps its
+# fast prefix search, and carries exactly one group so match.lastindex identifies the branch.
+TOKEN_BRANCHES = (
+    [(r'\n[^\S\n]*\n\s*()', ('sep', None, 0))]
+    + [(rf'\*\*{name}\*\*:[^\S\n]*([^\n]*)', ('field', field, rank)) for name, field, rank in BOLD_FIELDS]
+    + [(rf'{name}:[^\S\n]*([^\n]*)', ('field', field, rank)) for name, field, rank in LABEL_FIELDS]
+    + [(r'# ([^\n]+)', ('field', 'title', HEADING_RANK)),
+       (r'\((\d{4})\)', ('year', 'year', PAREN_YEAR_RANK)),
+       (r'https?://\S+()', ('url', 'url', BARE_URL_RANK))]
+)
+TOKEN_PATTERN = re.compile('|'.join(pattern for pattern, _ in TOKEN_BRANCHES))
+TOKEN_KINDS = {index: kind for index, (_, kind) in enumerate(TOKEN_BRANCHES, start=1)}
+DOI_LABEL_GROUP = 1 + len(BOLD_FIELDS) + [name for name, _, _ in LABEL_FIELDS].index('DOI') + 1
+
+LEADING_PATTERNS = {'year': LEADING_YEAR, 'relevance': LEADING_NUMBER, 'url': LEADING_URL}
+
+def _next_line(text: str, pos: int) -> str:
+    # The old per-field patterns used `Label:\s*`, so an empty label takes its value from the next line
+    if not text.startswith('\n', pos):
+        return ''
+    end = text.find('\n', pos + 1)
+    return text[pos + 1:end if end >= 0 else len(text)].strip()
+
+def _offer(fields: Dict[str, Tuple[int, str]], field: str, rank: int, value: Optional[str]):
+    if value and (field not in fields or rank < fields[field][0]):
+        fields[field] = (rank, value)
+
+def _build_citation(text: str, start: int, end: int, fields: Dict[str, Tuple[int, str]],
+                    abstract_start: Optional[int]) -> Optional[Citation]:
+    if 'title' not in fields or len(text[start:end].strip()) < MIN_SECTION_LENGTH:
+        return None
+    if sum(1 for field in ('title', 'authors', 'journal', 'year', 'url') if field in fields) < 3:
+        return None
+
+    value = lambda field, default=None: fields[field][1] if field in fields else default
+    url = value('url', 'Unknown')
+    doi = value('doi')
+    if doi is None:
+        doi_match = DOI_PATTERN.search(url)
+        doi = doi_match.group(1).rstrip('.,;)') if doi_match else None
+    abstract = text[abstract_start:end].strip() if abstract_start is not None else None
+
+    return Citation(
+        title=value('title'),
+        authors=value('authors', 'Unknown'),
+        journal=value('journal', 'Unknown'),
+        year=value('year', 'Unknown'),
+        url=url,
+        doi=doi,
+        abstract=abstract or None,
+        relevance=int(value('relevance', 7)),
+        source_type=value('source_type', 'journal_article')
+    )
+
+def iter_citations(text: str) -> Iterator[Citation]:
+    start, fields, abstract_start = 0, {}, None
+    match = TOKEN_PATTERN.search(text)
+    while match:
+        kind, field, rank = TOKEN_KINDS[match.lastindex]
+        # A field value runs to the end of its line, but the old per-field searches still found other
+        # labels, years and URLs inside it, so scanning resumes where the value starts
+        resume = match.start(match.lastindex) if kind == 'field' else match.end()
+        if kind == 'field':
+            value = match.group(match.lastindex)
+            if field == 'abstract':
+                if abstract_start is None:
+                    abstract_start = match.start(match.lastindex)
+            else:
+                if not value.strip():
+                    value = _next_line(text, match.end())
+                pattern = LEADING_PATTERNS.get(field)
+                if pattern is not None:
+                    leading = pattern.match(value)
+                    _offer(fields, field, rank, leading.group(0) if leading else None)
+                else:
+                    _offer(fields, field, rank, value.strip())
+                if match.lastindex == DOI_LABEL_GROUP:
+                    doi_match = DOI_PATTERN.search(value)
+                    _offer(fields, 'doi', 0, doi_match.group(1).rstrip('.,;)') if doi_match else None)
+        elif kind == 'sep':
+            citation = _build_citation(text, start, match.start(), fields, abstract_start)
+            if citation:
+                yield citation
+            start, fields, abstract_start = match.end(), {}, None
+        elif kind == 'url':
+            _offer(fields, field, rank, match.group())
+        else:
+            _offer(fields, field, rank, match.group(match.lastindex))
+        match = TOKEN_PATTERN.search(text, resume)
+
+    citation = _build_citation(text, start, len(text), fields, abstract_start)
+    if citation:
+        yield citation
+
+def citation_key(citation: Citation) -> str:
+    if citation.doi:
+        return f"doi:{citation.doi.lower()}"
+    if citation.url and citation.url != 'Unknown':
+        return f"url:{citation.url.lower().rstrip('/.,;')}"
+    title = re.sub(r'\W+', ' ', citation.title.lower()).strip()
+    return f"title:{hashlib.sha1(title.encode('utf-8')).hexdigest()}"
+
+def extract_citations(text: str) -> List[Citation]:
+    unique: Dict[str, Citation] = {}
+    for citation in iter_citations(text):
+        key = citation_key(citation)
+        if key not in unique or citation.relevance > unique[key].relevance:
+            unique[key] = citation
+    return list(unique.values())
+
+if __name__ == "__main__":
+    import time
+
+    entry = (
+        "Title: Effect of nitrogen management on wheat yield in Punjab ({i})\n"
+        "Authors: Singh, A., Kaur, B.\n"
+        "Journal: Field Crops Research\n"
+        "Year: 2021\n"
+        "URL: https://doi.org/10.1016/j.fcr.2021.{i}\n"
+        "Type: journal_article\n"
+        "Relevance: 8\n"
+        "Abstract: Split nitrogen application improved grain yield and nitrogen use efficiency."
+    )
+    prose = ("Nitrogen use efficiency in irrigated wheat depends on the timing, placement and source of "
+             "fertilizer, and farmers in the Indo-Gangetic plains often apply urea in two splits. ") * 12
+
+    # The same record with every field on one line, as some responses format it
+    one_line = entry.replace("\n", " | ")
+
+    for label, template, separator in (("dense", entry, "\n\n"), ("with prose", entry, "\n" + prose + "\n\n"),
+                                       ("one line", one_line, "\n\n")):
+        for count in (1000, 10000):
+            # Every entry appears twice so the dedupe step has work to do
+            text = separator.join(template.format(i=i % (count // 2)) for i in range(count))
+            start = time.perf_counter()
+            citations = extract_citations(text)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>10} {count:>6} entries ({len(text) / 1e6:5.2f} MB): {elapsed * 1000:8.1f} ms, "
+                  f"{len(citations)} unique citations")
@@ -1,12 +1,9 @@
 import sys
 import os
-import requests
 import json
 from typing import List, Dict, Optional, Tuple, Any
 from urllib.parse import urlparse
-from dataclasses import dataclass
-import re
-from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 import logging
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,26 +19,19 @@ from dotenv import load_dotenv
 from agno.tools.tavily import TavilyTools
 from Tools.web_scrapper import scrape_agri_prices, scrape_policy_updates, scrape_links
 
+try:
+    from Deep_Research.citation_parser import Citation, extract_citations
+    from Deep_Research.research_cache import get_research_cache
+    from Deep_Research.url_validator import get_url_validator
+except ImportError:
+    from citation_parser import Citation, extract_citations
+    from research_cache import get_research_cache
+    from url_validator import get_url_validator
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-@dataclass
-class Citation:
-    title: str
-    authors: str
-    journal: str
-    year: str
-    url: str
-    source_type: str
-    relevance: int
-    doi: Optional[str] = None
-    abstract: Optional[str] = None
-    keywords: List[str] = None
-
-    def to_apa(self) -> str:
-        return f"{self.authors} ({self.year}). {self.title}. {self.journal}."
-
 class EnhancedCitationAgent:
     def __init__(self):
         self.agent = Agent(
@@ -115,129 +105,51 @@ class EnhancedCitationAgent:
         """
 
     def _validate_url_batch(self, urls: List[str]) -> Dict[str, bool]:
-        def check_url(url: str) -> Tuple[str, bool]:
+        results = {}
+        to_check = []
+        for url in urls:
+            if not url or not url.startswith(('http://', 'https://')):
+                results[url] = False
+                continue
+            
+            domain = urlparse(url).netloc.lower().replace('www.', '')
+            if any(trusted in domain for trusted in self.trusted_domains):
+                to_check.append(url)
+            else:
+                results[url] = False
+        
+        if to_check:
             try:
-                if not url or not url.startswith(('http://', 'https://')):
-                    return url, False
-                
-                parsed_url = urlparse(url)
-                domain = parsed_url.netloc.lower().replace('www.', '')
-                
-                is_trusted = any(trusted in domain for trusted in self.trusted_domains)
-                if not is_trusted:
-                    return url, False
-                
-                response = requests.head(url, timeout=10, allow_redirects=True)
-                return url, response.status_code == 200
-                
-            except Exception:
-                return url, False
-
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            results = list(executor.map(check_url, urls))
+                results.update(get_url_validator().validate(to_check))
+            except Exception as e:
+                logger.error(f"URL validation failed: {str(e)}")
+                results.update({url: False for url in to_check})
         
-        return dict(results)
+        return results
 
     def _extract_citations_enhanced(self, response_text: str) -> List[Citation]:
-        citations = []
-        
-        citation_patterns = [
-            r'Title:\s*(.+?)(?:\n|$)',
-            r'\*\*Title\*\*:\s*(.+?)(?:\n|$)',
-            r'# (.+?)(?:\n|$)'
-        ]
-        
-        author_patterns = [
-            r'Authors?:\s*(.+?)(?:\n|$)',
-            r'\*\*Authors?\*\*:\s*(.+?)(?:\n|$)'
-        ]
-        
-        journal_patterns = [
-            r'Journal:\s*(.+?)(?:\n|$)',
-            r'Source:\s*(.+?)(?:\n|$)',
-            r'\*\*Journal\*\*:\s*(.+?)(?:\n|$)'
-        ]
-        
-        year_patterns = [
-            r'Year:\s*(\d{4})',
-            r'\*\*Year\*\*:\s*(\d{4})',
-            r'\((\d{4})\)'
-        ]
-        
-        url_patterns = [
-            r'URL:\s*(https?://[^\s\n]+)',
-            r'DOI:\s*(https?://[^\s\n]+)',
-            r'Link:\s*(https?://[^\s\n]+)',
-            r'(https?://[^\s\n]+)'
-        ]
-        
-        sections = re.split(r'\n\s*\n', response_text)
-        
-        for section in sections:
-            if len(section.strip()) < 50:
-                continue
-                
-            citation_data = {}
-            
-            for pattern in citation_patterns:
-                match = re.search(pattern, section)
-                if match:
-                    citation_data['title'] = match.group(1).strip()
-                    break
-            
-            for pattern in author_patterns:
-                match = re.search(pattern, section)
-                if match:
-                    citation_data['authors'] = match.group(1).strip()
-                    break
-            
-            for pattern in journal_patterns:
-                match = re.search(pattern, section)
-                if match:
-                    citation_data['journal'] = match.group(1).strip()
-                    break
-            
-            for pattern in year_patterns:
-                match = re.search(pattern, section)
-                if match:
-                    citation_data['year'] = match.group(1).strip()
-                    break
-            
-            urls_found = []
-            for pattern in url_patterns:
-                matches = re.findall(pattern, section)
-                urls_found.extend(matches)
-            
-            if urls_found:
-                citation_data['url'] = urls_found[0]
-            
-            relevance_match = re.search(r'Relevance:\s*(\d+)', section)
-            relevance = int(relevance_match.group(1)) if relevance_match else 7
-            
-            type_match = re.search(r'Type:\s*(.+?)(?:\n|$)', section)
-            source_type = type_match.group(1).strip() if type_match else 'journal_article'
-            
-            abstract_match = re.search(r'Abstract:\s*(.+?)(?:\n\n|$)', section, re.DOTALL)
-            abstract = abstract_match.group(1).strip() if abstract_match else None
-            
-            if 'title' in citation_data and len(citation_data) >= 3:
-                citation = Citation(
-                    title=citation_data.get('title', ''),
-                    authors=citation_data.get('authors', 'Unknown'),
-                    journal=citation_data.get('journal', 'Unknown'),
-                    year=citation_data.get('year', 'Unknown'),
-                    url=citation_data.get('url', 'Unknown'),
-                    abstract=abstract,
-                    relevance=relevance,
-                    source_type=source_type
-                )
-                citations.append(citation)
-        
-        return citations
+        return extract_citations(response_text)
+
+    def _cached_citations(self, topic: str, num_citations: int, focus_areas: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        cached = get_research_cache().get("citations", topic, str(num_citations), " ".join(focus_areas or []))
+        if not cached:
+            return None
+        logger.info(f"Reusing cached citations for: {topic}")
+        return {**cached, "citations": [Citation(**citation) for citation in cached["citations"]], "cached": True}
+
+    def _store_citations(self, topic: str, num_citations: int, focus_areas: Optional[List[str]], result: Dict[str, Any]):
+        if result.get("success"):
+            payload = {**result, "citations": [asdict(citation) for citation in result["citations"]]}
+            get_research_cache().put("citations", payload, topic, str(num_citations), " ".join(focus_areas or []))
 
     def find_citations_basic(self, topic: str, num_citations: int = 15, 
-                            focus_areas: List[str] = None) -> Dict[str, Any]:
+                            focus_areas: List[str] = None, force_refresh: bool = False) -> Dict[str, Any]:
         """Basic citation finding method"""
+        if not force_refresh:
+            cached = self._cached_citations(topic, num_citations, focus_areas)
+            if cached:
+                return cached
+        
         logger.info(f"Starting basic citation search for: {topic}")
         
         try:
@@ -280,7 +192,7 @@ class EnhancedCitationAgent:
             
             logger.info(f"Found {len(valid_citations)} valid citations")
             
-            return {
+            result = {
                 "success": len(valid_citations) > 0,
                 "citations": valid_citations,
                 "valid_count": len(valid_citations),
@@ -288,6 +200,8 @@ class EnhancedCitationAgent:
                 "search_query": search_query,
                 "focus_areas": focus_areas
             }
+            self._store_citations(topic, num_citations, focus_areas, result)
+            return result
         except Exception as e:
             logger.error(f"Error during basic citation search: {str(e)}")
             return {
@@ -299,8 +213,13 @@ class EnhancedCitationAgent:
             }
 
     def find_citations_enhanced(self, topic: str, num_citations: int = 15, 
-                               focus_areas: List[str] = None) -> Dict[str, Any]:
+                               focus_areas: List[str] = None, force_refresh: bool = False) -> Dict[str, Any]:
         """Enhanced citation finding with comprehensive search across multiple sources"""
+        if not force_refresh:
+            cached = self._cached_citations(topic, num_citations, focus_areas)
+            if cached:
+                return cached
+        
         logger.info(f"Starting enhanced citation search for: {topic}")
         
         try:
@@ -343,7 +262,7 @@ class EnhancedCitationAgent:
             
             logger.info(f"Found {len(valid_citations)} valid citations")
             
-            return {
+            result = {
                 "success": len(valid_citations) > 0,
                 "citations": valid_citations,
                 "valid_count": len(valid_citations),
@@ -351,6 +270,8 @@ class EnhancedCitationAgent:
                 "search_query": search_query,
                 "focus_areas": focus_areas
             }
+            self._store_citations(topic, num_citations, focus_areas, result)
+            return result
         except Exception as e:
             logger.error(f"Error during enhanced citation search: {str(e)}")
             return {
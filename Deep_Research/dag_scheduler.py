@@ -0,0 +1,57 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class DAGScheduler:
+    """Run callables as soon as their dependencies have finished, with bounded parallelism."""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+
+    def run(self, nodes: Dict[str, Callable[[Dict[str, Any]], Any]],
+            dependencies: Optional[Dict[str, List[str]]] = None,
+            priorities: Optional[Dict[str, int]] = None,
+            on_complete: Optional[Callable[[str, Any, Optional[Exception]], None]] = None
+            ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        dependencies = {
+            node: [dep for dep in (dependencies or {}).get(node, []) if dep in nodes and dep != node]
+            for node in nodes
+        }
+        priorities = priorities or {}
+        pending = set(nodes)
+        finished = set()
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            running = {}
+
+            def submit_ready():
+                ready = [node for node in pending if all(dep in finished for dep in dependencies[node])]
+                if not ready and not running and pending:
+                    logger.warning(f"Dependency cycle among {sorted(pending)}, running them unordered")
+                    ready = list(pending)
+                for node in sorted(ready, key=lambda n: -priorities.get(n, 0)):
+                    pending.discard(node)
+                    inputs = {dep: results.get(dep) for dep in dependencies[node]}
+                    running[executor.submit(nodes[node], inputs)] = node
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        results[node] = future.result()
+                    else:
+                        errors[node] = error
+                        logger.error(f"DAG node {node} failed: {error}")
+                    finished.add(node)
+                    if on_complete:
+                        on_complete(node, results.get(node), error)
+                submit_ready()
+
+        return results, errors
@@ -0,0 +1,212 @@
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('DEEP_RESEARCH_JOBS_DB', os.path.join(PROJECT_ROOT, 'cache', 'research_jobs.db'))
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# A job that keeps taking the process down on restart is given up on after this many starts
+MAX_ATTEMPTS = int(os.getenv('DEEP_RESEARCH_MAX_ATTEMPTS', 3))
+
+def to_jsonable(value: Any) -> Any:
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if is_dataclass(value) and not isinstance(value, type):
+        return to_jsonable(asdict(value))
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+class ResearchJobManager:
+    def __init__(self, workflow, db_path: str = DEFAULT_DB_PATH, max_concurrency: int = 2):
+        self.workflow = workflow
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="research-job")
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+        self._resume_pending()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS research_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    objective TEXT NOT NULL,
+                    location TEXT,
+                    focus_areas TEXT,
+                    status TEXT NOT NULL,
+                    current_phase TEXT,
+                    result TEXT,
+                    pdf_path TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    force_refresh INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            columns = [row['name'] for row in conn.execute("PRAGMA table_info(research_jobs)").fetchall()]
+            if 'force_refresh' not in columns:
+                conn.execute("ALTER TABLE research_jobs ADD COLUMN force_refresh INTEGER NOT NULL DEFAULT 0")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS research_job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    phase TEXT,
+                    message TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+            """)
+
+    def _update(self, job_id: str, **fields):
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE research_jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def _record_event(self, job_id: str, phase: str, message: str):
+        with self._lock, self._connect() as conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM research_job_events WHERE job_id = ?",
+                               (job_id,)).fetchone()[0]
+            conn.execute("""
+                INSERT INTO research_job_events (job_id, seq, phase, message, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (job_id, seq, phase, message, datetime.now().isoformat()))
+            conn.execute("UPDATE research_jobs SET current_phase = ? WHERE job_id = ?", (phase, job_id))
+
+    def _resume_pending(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT job_id, attempts FROM research_jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) ORDER BY created_at",
+                ACTIVE_STATUSES
+            ).fetchall()
+        for row in rows:
+            if row['attempts'] >= MAX_ATTEMPTS:
+                logger.warning(f"Deep research job {row['job_id']} did not finish in {row['attempts']} attempts, marking failed")
+                self._update(row['job_id'], status='failed', error=f"Abandoned after {row['attempts']} interrupted attempts",
+                             finished_at=datetime.now().isoformat())
+                continue
+            logger.info(f"Resuming deep research job {row['job_id']} after restart")
+            self._update(row['job_id'], status='queued')
+            self.executor.submit(self._run_job, row['job_id'])
+
+    def submit(self, objective: str, location: str = "Global", focus_areas: Optional[List[str]] = None,
+               force_refresh: bool = False) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO research_jobs (job_id, objective, location, focus_areas, force_refresh, status, current_phase, created_at)
+                VALUES (?, ?, ?, ?, ?, 'queued', 'queued', ?)
+            """, (job_id, objective, location, json.dumps(focus_areas or []), int(force_refresh), datetime.now().isoformat()))
+        self.executor.submit(self._run_job, job_id)
+        return {"job_id": job_id, "status": "queued"}
+
+    def _run_job(self, job_id: str):
+        with self._connect() as conn:
+            job = conn.execute("SELECT * FROM research_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if job is None or job['status'] not in ACTIVE_STATUSES:
+            return
+
+        self._update(job_id, status='running', started_at=datetime.now().isoformat(), attempts=job['attempts'] + 1)
+        try:
+            results = self.workflow.execute_research(
+                objective=job['objective'],
+                location=job['location'] or "Global",
+                focus_areas=json.loads(job['focus_areas'] or '[]'),
+                progress_callback=lambda phase, message: self._record_event(job_id, phase, message),
+                run_id=f"job_{job_id}",
+                force_refresh=bool(job['force_refresh'])
+            )
+
+            pdf_path = None
+            if results.get('final_report'):
+                try:
+                    pdf_path = self.workflow.save_pdf_report(results, f"research_job_{job_id}.pdf")
+                except Exception as e:
+                    logger.warning(f"PDF generation failed for job {job_id}: {e}")
+
+            self._update(
+                job_id,
+                status='completed' if results.get('success') else 'failed',
+                current_phase='finished',
+                result=json.dumps(to_jsonable(results)),
+                pdf_path=pdf_path,
+                error=results.get('error'),
+                finished_at=datetime.now().isoformat()
+            )
+        except Exception as e:
+            logger.error(f"Deep research job {job_id} failed: {e}")
+            self._update(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+
+    def get_status(self, job_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            job = conn.execute("""
+                SELECT job_id, objective, location, status, current_phase, pdf_path, error, attempts,
+                       created_at, started_at, finished_at
+                FROM research_jobs WHERE job_id = ?
+            """, (job_id,)).fetchone()
+            if job is None:
+                return None
+            events = conn.execute("""
+                SELECT seq, phase, message, created_at FROM research_job_events
+                WHERE job_id = ? AND seq > ? ORDER BY seq
+            """, (job_id, since)).fetchall()
+
+        status = dict(job)
+        status["pdf_available"] = bool(status.pop("pdf_path"))
+        status["events"] = [dict(event) for event in events]
+        status["last_seq"] = events[-1]['seq'] if events else since
+        return status
+
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, result FROM research_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {"status": row['status'], "result": json.loads(row['result']) if row['result'] else None}
+
+    def get_pdf_path(self, job_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT pdf_path FROM research_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None or not row['pdf_path'] or not os.path.exists(row['pdf_path']):
+            return None
+        return row['pdf_path']
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT job_id, objective, status, current_phase, created_at, finished_at
+                FROM research_jobs ORDER BY created_at DESC LIMIT ?
+            """, (limit,)).fetchall()
+        return [dict(row) for row in rows]
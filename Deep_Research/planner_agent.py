@@ -7,6 +7,11 @@ from dotenv import load_dotenv
 from datetime import datetime
 import logging
 
+try:
+    from Deep_Research.research_cache import get_research_cache
+except ImportError:
+    from research_cache import get_research_cache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -108,7 +113,14 @@ class AgriculturalPlanningAgent:
         
         return queries[:3]
 
-    def create_plan(self, title: str, objective: str) -> ResearchPlan:
+    def create_plan(self, title: str, objective: str, force_refresh: bool = False) -> ResearchPlan:
+        cache = get_research_cache()
+        if not force_refresh:
+            cached = cache.get("plan", title, objective)
+            if cached:
+                logger.info(f"Reusing cached research plan for: {title}")
+                return ResearchPlan.model_validate(cached)
+        
         try:
             planning_query = f"""
             Create a comprehensive research plan for:
@@ -121,10 +133,8 @@ class AgriculturalPlanningAgent:
             
             response = self.planner.run(planning_query)
             
-            if hasattr(response, 'content') and isinstance(response.content, ResearchPlan):
-                plan = response.content
-            else:
-                plan = self._create_fallback_plan(title, objective)
+            generated = hasattr(response, 'content') and isinstance(response.content, ResearchPlan)
+            plan = response.content if generated else self._create_fallback_plan(title, objective)
             
             for task in plan.tasks:
                 domain, agent = self._determine_domain_and_agent(task.description, task.name)
@@ -135,6 +145,8 @@ class AgriculturalPlanningAgent:
             plan.agent_assignments = self._create_agent_assignments(plan.tasks)
             plan.execution_order = [task.task_id for task in sorted(plan.tasks, key=lambda t: t.priority, reverse=True)]
             
+            if generated:
+                cache.put("plan", plan.model_dump(mode='json'), title, objective)
             return plan
             
         except Exception as e:
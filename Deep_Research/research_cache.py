@@ -0,0 +1,114 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('DEEP_RESEARCH_CACHE_DB', os.path.join(PROJECT_ROOT, 'cache', 'research_cache.db'))
+
+DEFAULT_TTLS = {
+    'plan': 7 * 24 * 3600,
+    'search': 3 * 24 * 3600,
+    'search:tavily': 12 * 3600,
+    'citations': 7 * 24 * 3600
+}
+
+STOPWORDS = {"a", "an", "the", "of", "in", "on", "for", "and", "to", "with", "by", "about", "how", "what", "is"}
+
+def normalize_query(text: str) -> str:
+    tokens = re.findall(r'\w+', (text or "").lower())
+    return " ".join(token for token in tokens if token not in STOPWORDS)
+
+class ResearchCache:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, ttls: Optional[Dict[str, int]] = None):
+        self.db_path = db_path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.enabled = os.getenv('DEEP_RESEARCH_CACHE', '1') != '0'
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS research_cache (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    query TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key, bucket)
+                )
+            """)
+
+    def ttl_for(self, kind: str) -> int:
+        return self.ttls.get(kind) or self.ttls.get(kind.split(':')[0], DEFAULT_TTLS['search'])
+
+    def _bucket(self, kind: str, now: float) -> int:
+        # Only part of the row key; freshness is judged from created_at so every entry lives a full TTL
+        return int(now // self.ttl_for(kind))
+
+    def _key(self, *parts: str) -> str:
+        normalized = "|".join(normalize_query(part) for part in parts)
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, kind: str, *parts: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT payload FROM research_cache WHERE kind = ? AND key = ? AND created_at >= ?
+                ORDER BY created_at DESC LIMIT 1
+            """, (kind, self._key(*parts), time.time() - self.ttl_for(kind))).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind: str, payload: Any, *parts: str):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO research_cache (kind, key, bucket, query, payload, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (kind, self._key(*parts), self._bucket(kind, now), " | ".join(parts), json.dumps(payload), now))
+
+    def prune(self) -> int:
+        now = time.time()
+        removed = 0
+        with self._lock, self._connect() as conn:
+            for kind in [row[0] for row in conn.execute("SELECT DISTINCT kind FROM research_cache").fetchall()]:
+                removed += conn.execute("DELETE FROM research_cache WHERE kind = ? AND created_at < ?",
+                                        (kind, now - self.ttl_for(kind))).rowcount
+        return removed
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_research_cache() -> ResearchCache:
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = ResearchCache()
+            removed = _cache_instance.prune()
+            if removed:
+                logger.info(f"Pruned {removed} expired research cache entries")
+    return _cache_instance
@@ -1,23 +1,87 @@
+import os
+import json
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from typing import List, Optional
 from Deep_Research.workflow import DeepResearchWorkflow
+from Deep_Research.jobs import ResearchJobManager
 
 router = APIRouter(prefix="/api/v1", tags=["Deep Research"])
 workflow = DeepResearchWorkflow()
+jobs = ResearchJobManager(workflow, max_concurrency=int(os.getenv("DEEP_RESEARCH_CONCURRENCY", 2)))
 
 @router.post("/deep-research/")
 def run_deep_research(
     objective: str,
     location: Optional[str] = "Global",
-    focus_areas: Optional[List[str]] = Query(default=None)
+    focus_areas: Optional[List[str]] = Query(default=None),
+    force_refresh: bool = False
 ):
 
     try:
         result = workflow.execute_research(
             objective=objective,
             location=location,
-            focus_areas=focus_areas or []
+            focus_areas=focus_areas or [],
+            force_refresh=force_refresh
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/deep-research/jobs")
+def submit_deep_research_job(
+    objective: str,
+    location: Optional[str] = "Global",
+    focus_areas: Optional[List[str]] = Query(default=None),
+    force_refresh: bool = False
+):
+    return jobs.submit(objective, location, focus_areas or [], force_refresh)
+
+@router.get("/deep-research/jobs")
+def list_deep_research_jobs(limit: int = 20):
+    return {"jobs": jobs.list_jobs(limit)}
+
+@router.get("/deep-research/jobs/{job_id}")
+def get_deep_research_job(job_id: str, since: int = 0):
+    status = jobs.get_status(job_id, since)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@router.get("/deep-research/jobs/{job_id}/events")
+async def stream_deep_research_job(job_id: str, since: int = 0):
+    if await run_in_threadpool(jobs.get_status, job_id, since) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        last_seq = since
+        while True:
+            status = await run_in_threadpool(jobs.get_status, job_id, last_seq)
+            for event in status["events"]:
+                yield f"data: {json.dumps(event)}\n\n"
+            last_seq = status["last_seq"]
+            if status["status"] not in ("queued", "running"):
+                yield f"event: done\ndata: {json.dumps({'status': status['status']})}\n\n"
+                break
+            await asyncio.sleep(1)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@router.get("/deep-research/jobs/{job_id}/result")
+def get_deep_research_result(job_id: str):
+    result = jobs.get_result(job_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if result["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job is still {result['status']}")
+    return result
+
+@router.get("/deep-research/jobs/{job_id}/pdf")
+def get_deep_research_pdf(job_id: str):
+    pdf_path = jobs.get_pdf_path(job_id)
+    if pdf_path is None:
+        raise HTTPException(status_code=404, detail="PDF not available")
+    return FileResponse(pdf_path, media_type="application/pdf", filename=os.path.basename(pdf_path))
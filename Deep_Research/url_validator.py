@@ -0,0 +1,166 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('URL_VALIDITY_DB', os.path.join(PROJECT_ROOT, 'cache', 'url_validity.db'))
+
+VALID_TTL = int(os.getenv('URL_VALID_TTL', 7 * 24 * 3600))
+INVALID_TTL = int(os.getenv('URL_INVALID_TTL', 24 * 3600))
+
+# Servers that refuse HEAD answer with these, so they get a GET before being judged
+HEAD_UNSUPPORTED = {400, 403, 405, 406, 501}
+# Rate limits and request timeouts say nothing about the URL itself, so they are never cached
+TRANSIENT_STATUS = {408, 429}
+
+class URLValidityCache:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, valid_ttl: int = VALID_TTL, invalid_ttl: int = INVALID_TTL):
+        self.db_path = db_path
+        self.valid_ttl = valid_ttl
+        self.invalid_ttl = invalid_ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS url_checks (
+                    url TEXT PRIMARY KEY,
+                    valid INTEGER NOT NULL,
+                    status INTEGER,
+                    checked_at REAL NOT NULL
+                )
+            """)
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, bool]:
+        urls = list(urls)
+        if not urls:
+            return {}
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT url, valid, checked_at FROM url_checks WHERE url IN ({','.join('?' * len(urls))})", urls
+            ).fetchall()
+        return {
+            url: bool(valid) for url, valid, checked_at in rows
+            if now - checked_at < (self.valid_ttl if valid else self.invalid_ttl)
+        }
+
+    def put_many(self, checks: Dict[str, Tuple[bool, Optional[int]]]):
+        if not checks:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO url_checks (url, valid, status, checked_at) VALUES (?, ?, ?, ?)
+            """, [(url, int(valid), status, now) for url, (valid, status) in checks.items()])
+
+    def prune(self) -> int:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            return conn.execute("""
+                DELETE FROM url_checks WHERE (valid = 1 AND checked_at < ?) OR (valid = 0 AND checked_at < ?)
+            """, (now - self.valid_ttl, now - self.invalid_ttl)).rowcount
+
+class URLValidator:
+    """Checks URLs on a long-lived event loop so the pooled client survives across batches."""
+
+    def __init__(self, cache: Optional[URLValidityCache] = None, per_host: int = 4, max_connections: int = 32,
+                 connect_timeout: float = 3.0, read_timeout: float = 8.0):
+        self.cache = cache or URLValidityCache()
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="url-validator", daemon=True)
+        self._thread.start()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; AgriResearchBot/1.0)"},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections // 2)
+            )
+        return self._client
+
+    async def _check(self, url: str) -> Tuple[bool, Optional[int]]:
+        # Malformed URLs (bad ports, hosts, schemes) raise outside httpx.HTTPError and must not fail the batch
+        try:
+            host = urlparse(url).netloc.lower()
+            slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+            client = self._get_client()
+
+            async with slots:
+                response = await client.head(url)
+                status = response.status_code
+                if status in HEAD_UNSUPPORTED:
+                    async with client.stream("GET", url) as response:
+                        status = response.status_code
+                return 200 <= status < 400, status
+        except Exception as e:
+            logger.debug(f"URL check failed for {url}: {e}")
+            return False, None
+
+    async def _check_all(self, urls: List[str]) -> Dict[str, Tuple[bool, Optional[int]]]:
+        checks = await asyncio.gather(*(self._check(url) for url in urls))
+        return dict(zip(urls, checks))
+
+    def validate(self, urls: Iterable[str], use_cache: bool = True) -> Dict[str, bool]:
+        urls = list(dict.fromkeys(url for url in urls if url))
+        results = self.cache.get_many(urls) if use_cache else {}
+        pending = [url for url in urls if url not in results]
+
+        if pending:
+            checks = asyncio.run_coroutine_threadsafe(self._check_all(pending), self._loop).result()
+            # Timeouts and server errors are likely transient, so only definite answers are remembered
+            self.cache.put_many({
+                url: (valid, status) for url, (valid, status) in checks.items()
+                if status is not None and status < 500 and status not in TRANSIENT_STATUS
+            })
+            results.update({url: valid for url, (valid, _) in checks.items()})
+
+        logger.info(f"Validated {len(urls)} URLs ({len(urls) - len(pending)} from cache)")
+        return results
+
+    def close(self):
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+_validator_instance = None
+_validator_lock = threading.Lock()
+
+def get_url_validator() -> URLValidator:
+    global _validator_instance
+    with _validator_lock:
+        if _validator_instance is None:
+            _validator_instance = URLValidator(per_host=int(os.getenv('URL_VALIDATION_PER_HOST', 4)))
+            removed = _validator_instance.cache.prune()
+            if removed:
+                logger.info(f"Pruned {removed} expired URL checks")
+    return _validator_instance
@@ -1,7 +1,10 @@
 import os
 import sys
+import uuid
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -21,16 +24,22 @@ from .planner_agent import AgriculturalPlanningAgent
 from .SubsearchAgent import EnhancedSubsearchAgent
 from .citations_agent import EnhancedCitationAgent
 from .report_agent import EnhancedReportAgent
+from .dag_scheduler import DAGScheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MAX_RESEARCH_QUERIES = 8
+QUERIES_PER_TASK = 2
+
 @dataclass
 class ResearchState:
+    run_id: str = ""
     title: str = ""
     objective: str = ""
     location: str = "Global"
     focus_areas: List[str] = None
+    force_refresh: bool = False
     
     plan: Any = None
     tasks: List[Any] = None
@@ -382,6 +391,11 @@ class DeepResearchWorkflow:
         self.report_agent = EnhancedReportAgent()
         self.pdf_generator = PDFReportGenerator()
         
+        self.background = ThreadPoolExecutor(max_workers=4, thread_name_prefix="deep-research")
+        self._citation_jobs: Dict[str, Any] = {}
+        self._progress_callbacks: Dict[str, Callable[[str, str], None]] = {}
+        self._citation_lock = threading.Lock()
+        
         self.graph = self._build_workflow_graph()
         self.app = self.graph.compile(checkpointer=MemorySaver())
 
@@ -409,13 +423,20 @@ class DeepResearchWorkflow:
         log_entry = f"[{timestamp}] {phase.upper()}: {message}"
         state.execution_log.append(log_entry)
         logger.info(log_entry)
+        
+        callback = self._progress_callbacks.get(state.run_id)
+        if callback:
+            try:
+                callback(phase, log_entry)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
 
     def _planning_phase(self, state: ResearchState) -> ResearchState:
         self._log_phase(state, "planning", "Starting research planning phase")
         state.current_phase = "planning"
         
         try:
-            plan = self.planner.create_plan(state.title, state.objective)
+            plan = self.planner.create_plan(state.title, state.objective, force_refresh=state.force_refresh)
             state.plan = plan
             state.tasks = plan.tasks
             
@@ -429,28 +450,71 @@ class DeepResearchWorkflow:
         
         return state
 
+    def _plan_task_queries(self, state: ResearchState) -> Dict[str, Tuple[Any, List[str]]]:
+        if not state.tasks:
+            return {}
+        
+        order = {task_id: i for i, task_id in enumerate(state.plan.execution_order)} if state.plan else {}
+        tasks = sorted(state.tasks, key=lambda task: order.get(getattr(task, 'task_id', ''), len(order)))
+        
+        budget = MAX_RESEARCH_QUERIES
+        planned = {}
+        for i, task in enumerate(tasks):
+            if budget <= 0:
+                break
+            if hasattr(task, 'subsearch_queries') and task.subsearch_queries:
+                queries = task.subsearch_queries[:min(QUERIES_PER_TASK, budget)]
+            elif hasattr(task, 'description'):
+                queries = [task.description]
+            else:
+                continue
+            planned[getattr(task, 'task_id', None) or f"task_{i}"] = (task, queries)
+            budget -= len(queries)
+        
+        return planned
+
     def _research_execution_phase(self, state: ResearchState) -> ResearchState:
         self._log_phase(state, "research", "Starting research execution phase")
         state.current_phase = "research_execution"
+        start_time = datetime.now()
         
         try:
-            if not state.tasks:
+            planned = self._plan_task_queries(state)
+            if not planned:
                 self._log_phase(state, "research", "No tasks available, using objective for research")
-                research_queries = [f"{state.title} {state.objective}"]
-            else:
-                research_queries = []
-                for task in state.tasks:
-                    if hasattr(task, 'subsearch_queries') and task.subsearch_queries:
-                        research_queries.extend(task.subsearch_queries[:2])
-                    elif hasattr(task, 'description'):
-                        research_queries.append(task.description)
-                
-                if not research_queries:
-                    research_queries = [f"{state.title} {state.objective}"]
-            
-            research_queries = research_queries[:8]
+                planned = {"objective": (None, [f"{state.title} {state.objective}"])}
+            
+            def task_node(task, queries):
+                def run(dependency_results: Dict[str, Any]) -> List[Any]:
+                    context = None
+                    if dependency_results:
+                        names = [getattr(planned[dep][0], 'name', dep) for dep in dependency_results]
+                        context = f"Builds on completed research: {', '.join(names)}"
+                    return self.subsearch_agent.search_parallel(queries, context, force_refresh=state.force_refresh)
+                return run
+            
+            def on_complete(task_id: str, results: Optional[List[Any]], error: Optional[Exception]):
+                if error is None:
+                    succeeded = sum(1 for result in results if result.success)
+                    self._log_phase(state, "research", f"Task {task_id} finished: {succeeded}/{len(results)} searches succeeded")
+                else:
+                    state.errors.append(f"Research task {task_id} failed: {error}")
+            
+            scheduler = DAGScheduler(max_workers=max(1, self.subsearch_agent.llm_concurrency // len(self.subsearch_agent.agents)))
+            task_results, _ = scheduler.run(
+                nodes={task_id: task_node(task, queries) for task_id, (task, queries) in planned.items()},
+                dependencies={task_id: list(getattr(task, 'dependencies', []) or []) for task_id, (task, _) in planned.items()},
+                priorities={task_id: getattr(task, 'priority', 1) for task_id, (task, _) in planned.items()},
+                on_complete=on_complete
+            )
             
-            research_results = self.subsearch_agent.search_optimized(research_queries)
+            all_results = [result for task_id in planned for result in task_results.get(task_id, [])]
+            research_results = self.subsearch_agent.summarize_results(
+                all_results,
+                sum(len(queries) for _, queries in planned.values()),
+                (datetime.now() - start_time).total_seconds(),
+                "dag_execution"
+            )
             
             state.research_results = research_results
             
@@ -466,18 +530,30 @@ class DeepResearchWorkflow:
         
         return state
 
+    def _gather_citations(self, title: str, objective: str, force_refresh: bool = False) -> Dict[str, Any]:
+        return self.citation_agent.find_citations_basic(
+            topic=f"{title} {objective}",
+            num_citations=15,
+            force_refresh=force_refresh
+        )
+
+    def _start_citation_gathering(self, state: ResearchState):
+        with self._citation_lock:
+            self._citation_jobs[state.run_id] = self.background.submit(self._gather_citations, state.title, state.objective, state.force_refresh)
+
     def _citation_gathering_phase(self, state: ResearchState) -> ResearchState:
         self._log_phase(state, "citations", "Starting citation gathering phase")
         state.current_phase = "citation_gathering"
         
         try:
-            search_topic = f"{state.title} {state.objective}"
-            num_citations = 15
+            with self._citation_lock:
+                job = self._citation_jobs.pop(state.run_id, None)
             
-            citation_results = self.citation_agent.find_citations_basic(
-                topic=search_topic,
-                num_citations=num_citations
-            )
+            if job is not None:
+                citation_results = job.result()
+                self._log_phase(state, "citations", "Collected citations gathered concurrently with research")
+            else:
+                citation_results = self._gather_citations(state.title, state.objective, state.force_refresh)
             
             state.citation_results = citation_results
             
@@ -631,19 +707,27 @@ class DeepResearchWorkflow:
             return f"Agricultural Research: {objective}"
 
     def execute_research(self, objective: str, location: str = "Global", 
-                        focus_areas: Optional[List[str]] = None) -> Dict[str, Any]:
+                        focus_areas: Optional[List[str]] = None,
+                        progress_callback: Optional[Callable[[str, str], None]] = None,
+                        run_id: Optional[str] = None, force_refresh: bool = False) -> Dict[str, Any]:
         title = self._generate_title_from_objective(objective)
         logger.info(f"Starting deep research workflow: {title}")
         
+        run_id = run_id or f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        if progress_callback:
+            self._progress_callbacks[run_id] = progress_callback
         initial_state = ResearchState(
+            run_id=run_id,
             title=title,
             objective=objective,
             location=location,
-            focus_areas=focus_areas or []
+            focus_areas=focus_areas or [],
+            force_refresh=force_refresh
         )
         
         try:
-            config = {"configurable": {"thread_id": f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}"}}
+            config = {"configurable": {"thread_id": run_id}}
+            self._start_citation_gathering(initial_state)
             
             final_state = initial_state
             
@@ -663,6 +747,8 @@ class DeepResearchWorkflow:
             
         except Exception as e:
             logger.error(f"Workflow execution failed: {str(e)}")
+            with self._citation_lock:
+                self._citation_jobs.pop(run_id, None)
             return {
                 "success": False,
                 "error": str(e),
@@ -677,6 +763,8 @@ class DeepResearchWorkflow:
                 "execution_summary": {},
                 "quality_validation": None
             }
+        finally:
+            self._progress_callbacks.pop(run_id, None)
 
     def _format_final_results(self, state: ResearchState) -> Dict[str, Any]:
         return {
@@ -1,45 +1,44 @@
 import requests
+import sqlite3
 import sys
 import json
 
-API_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
-API_KEY = "579b464db66ec23bdd000001a52cfa0cf9df446369ab0b90dbcd0df1"
+try:
+    from Tools.mandi_bulk_loader import MandiBulkLoader
+    from Tools.mandi_price_warehouse import get_mandi_warehouse
+except ImportError:
+    from mandi_bulk_loader import MandiBulkLoader
+    from mandi_price_warehouse import get_mandi_warehouse
 
-def fetch_market_price(state_name="Karnataka"):
+def _fetch_from_api(state_name, district=None, market=None, commodity=None, limit=4000):
+    filters = {"state.keyword": state_name.strip()}
+    wanted = {"district": district, "market": market, "commodity": commodity}
+    return [
+        record for record in MandiBulkLoader(store=None).iter_page(0, limit, filters)
+        if all(getattr(record, field).lower() == value.strip().lower() for field, value in wanted.items() if value)
+    ]
+
+def fetch_market_price(state_name="Karnataka", district=None, market=None, commodity=None):
     print(f"[INFO] Fetching market prices for state: {state_name}")
-    params = {
-        "api-key": API_KEY,
-        "format": "json",
-        "offset": "0",
-        "limit": "4000",
-    }
     
     try:
-        response = requests.get(API_URL, params=params, timeout=15)
-        response.raise_for_status()
-        data = response.json()
+        try:
+            warehouse = get_mandi_warehouse()
+            if warehouse.count(state_name) == 0:
+                print(f"[INFO] No local prices for {state_name}, loading from data.gov.in")
+                warehouse.load_state(state_name)
+            
+            records = warehouse.query(state=state_name, district=district, market=market, commodity=commodity)
+        except sqlite3.Error as e:
+            print(f"[WARN] Local price warehouse unavailable ({e}), querying data.gov.in directly")
+            records = _fetch_from_api(state_name, district, market, commodity)
         
     except requests.RequestException as e:
         error_msg = f"Failed to fetch data: {e}"
         print(f"[ERROR] {error_msg}")
         return {"error": error_msg, "data": []}
     
-    records = data.get("records", [])
-    filtered = []
-    
-    for record in records:
-        if record.get("state", "").strip().lower() == state_name.strip().lower():
-            filtered.append({
-                "state": record.get("state"),
-                "district": record.get("district"),
-                "market": record.get("market"),
-                "commodity": record.get("commodity"),
-                "variety": record.get("variety"),
-                "min_price": record.get("min_price"),
-                "max_price": record.get("max_price"),
-                "modal_price": record.get("modal_price"),
-                "arrival_date": record.get("arrival_date", "")
-            })
+    filtered = [record.to_response() for record in records]
     
     if filtered:
         print(f"[INFO] Found {len(filtered)} records for state: {state_name}")
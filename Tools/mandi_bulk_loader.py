@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import random
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+API_KEY = os.getenv("DATA_GOV_IN_API_KEY", "579b464db66ec23bdd000001a52cfa0cf9df446369ab0b90dbcd0df1")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+CHECKPOINT_PREFIX = "bulk_load_checkpoint:"
+
+@dataclass
+class MandiPriceRecord:
+    state: str
+    district: str
+    market: str
+    commodity: str
+    variety: str
+    grade: str
+    arrival_date: str
+    min_price: Optional[float]
+    max_price: Optional[float]
+    modal_price: Optional[float]
+
+    @classmethod
+    def from_api(cls, record: Dict) -> Optional["MandiPriceRecord"]:
+        arrival_date = parse_arrival_date(record.get("arrival_date", ""))
+        if not arrival_date:
+            return None
+        return cls(
+            state=(record.get("state") or "").strip(),
+            district=(record.get("district") or "").strip(),
+            market=(record.get("market") or "").strip(),
+            commodity=(record.get("commodity") or "").strip(),
+            variety=(record.get("variety") or "").strip(),
+            grade=(record.get("grade") or "").strip(),
+            arrival_date=arrival_date,
+            min_price=_to_float(record.get("min_price")),
+            max_price=_to_float(record.get("max_price")),
+            modal_price=_to_float(record.get("modal_price"))
+        )
+
+    def to_response(self) -> Dict:
+        return {
+            "state": self.state,
+            "district": self.district,
+            "market": self.market,
+            "commodity": self.commodity,
+            "variety": self.variety,
+            "min_price": self.min_price,
+            "max_price": self.max_price,
+            "modal_price": self.modal_price,
+            "arrival_date": format_arrival_date(self.arrival_date)
+        }
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_arrival_date(value: str) -> Optional[str]:
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value.strip(), fmt).strftime("%Y-%m-%d")
+        except (AttributeError, ValueError):
+            continue
+    return None
+
+def format_arrival_date(value: str) -> str:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%d/%m/%Y")
+    except (TypeError, ValueError):
+        return value or ""
+
+class MandiBulkLoader:
+    def __init__(self, store, page_size: int = 1000, max_workers: int = 8,
+                 max_retries: int = 4, backoff: float = 1.0, timeout: int = 30,
+                 batch_size: int = 500):
+        self.store = store
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _params(self, offset: int, limit: int, filters: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        params = {
+            "api-key": API_KEY,
+            "format": "json",
+            "offset": str(offset),
+            "limit": str(limit),
+        }
+        for column, value in (filters or {}).items():
+            params[f"filters[{column}]"] = value
+        return params
+
+    def _request(self, offset: int, limit: int, filters: Optional[Dict[str, str]] = None,
+                 stream: bool = False) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(API_URL, params=self._params(offset, limit, filters),
+                                            timeout=self.timeout, stream=stream)
+                if response.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                    response.close()
+                    raise requests.HTTPError(f"retryable status {response.status_code}")
+                response.raise_for_status()
+                return response
+            except requests.RequestException as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+                logger.warning(f"Page at offset {offset} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def fetch_json(self, offset: int, limit: int, filters: Optional[Dict[str, str]] = None) -> Dict:
+        return self._request(offset, limit, filters).json()
+
+    def iter_page(self, offset: int, limit: int, filters: Optional[Dict[str, str]] = None) -> Iterator[MandiPriceRecord]:
+        response = self._request(offset, limit, filters, stream=ijson is not None)
+        try:
+            if ijson is not None:
+                response.raw.decode_content = True
+                raw_records = ijson.items(response.raw, 'records.item', use_float=True)
+            else:
+                raw_records = response.json().get("records", [])
+
+            for raw in raw_records:
+                record = MandiPriceRecord.from_api(raw)
+                if record is not None:
+                    yield record
+        finally:
+            response.close()
+
+    def _load_page(self, offset: int, filters: Optional[Dict[str, str]] = None) -> int:
+        loaded = 0
+        batch: List[MandiPriceRecord] = []
+
+        for record in self.iter_page(offset, self.page_size, filters):
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                loaded += self.store.upsert(batch)
+                batch = []
+
+        if batch:
+            loaded += self.store.upsert(batch)
+        return loaded
+
+    def _checkpoint_key(self, filters: Optional[Dict[str, str]]) -> str:
+        return CHECKPOINT_PREFIX + json.dumps(filters or {}, sort_keys=True)
+
+    def probe(self, filters: Optional[Dict[str, str]] = None) -> Dict:
+        page = self.fetch_json(0, 1, filters)
+        return {
+            "total": int(page.get("total", 0) or 0),
+            "updated_date": str(page.get("updated_date", ""))
+        }
+
+    def load(self, filters: Optional[Dict[str, str]] = None, resume: bool = True) -> Dict:
+        start = time.perf_counter()
+        info = self.probe(filters)
+        total = info["total"]
+        checkpoint_key = self._checkpoint_key(filters)
+
+        watermark = 0
+        if resume:
+            saved = self.store.get_meta(checkpoint_key)
+            if saved:
+                checkpoint = json.loads(saved)
+                if checkpoint.get("updated_date") == info["updated_date"] and checkpoint.get("offset", 0) < total:
+                    watermark = checkpoint["offset"]
+                    logger.info(f"Resuming mandi bulk load from offset {watermark} of {total}")
+
+        offsets = iter(range(watermark, total, self.page_size))
+        completed = set()
+        loaded = 0
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+
+            def submit_next():
+                offset = next(offsets, None)
+                if offset is not None:
+                    in_flight[executor.submit(self._load_page, offset, filters)] = offset
+
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset = in_flight.pop(future)
+                    try:
+                        loaded += future.result()
+                        completed.add(offset)
+                    except Exception as e:
+                        logger.error(f"Mandi page at offset {offset} failed permanently: {e}")
+                        failed.append(offset)
+                    submit_next()
+
+                advanced = watermark
+                while advanced in completed:
+                    completed.discard(advanced)
+                    advanced += self.page_size
+                if advanced != watermark:
+                    watermark = advanced
+                    self.store.set_meta(checkpoint_key, json.dumps({
+                        "updated_date": info["updated_date"],
+                        "offset": min(watermark, total),
+                        "total": total
+                    }))
+
+        if not failed:
+            self.store.delete_meta(checkpoint_key)
+
+        stats = {
+            "total": total,
+            "loaded": loaded,
+            "failed_offsets": sorted(failed),
+            "updated_date": info["updated_date"],
+            "complete": not failed,
+            "seconds": round(time.perf_counter() - start, 2)
+        }
+        logger.info(f"Mandi bulk load finished: {stats}")
+        return stats
@@ -0,0 +1,129 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    from Tools.mandi_price_warehouse import get_mandi_warehouse
+except ImportError:
+    from mandi_price_warehouse import get_mandi_warehouse
+
+logger = logging.getLogger(__name__)
+
+PRICE_KEYS = ['state', 'district', 'market', 'commodity', 'variety']
+
+def load_price_frame(state_name: Optional[str] = None, commodity: Optional[str] = None,
+                     lookback_days: int = 7) -> pd.DataFrame:
+    warehouse = get_mandi_warehouse()
+    if state_name and warehouse.count(state_name) == 0:
+        warehouse.load_state(state_name)
+
+    since = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    records = warehouse.query(state=state_name, commodity=commodity, since=since, latest_only=False)
+    frame = pd.DataFrame([record.__dict__ for record in records])
+    if frame.empty:
+        return frame
+
+    frame['arrival_date'] = pd.to_datetime(frame['arrival_date'])
+    frame = frame.dropna(subset=['modal_price'])
+    return frame[frame['modal_price'] > 0]
+
+def latest_prices(frame: pd.DataFrame) -> pd.DataFrame:
+    latest = frame.sort_values('arrival_date').drop_duplicates(PRICE_KEYS, keep='last')
+    return latest.reset_index(drop=True)
+
+def commodity_spreads(latest: pd.DataFrame) -> pd.DataFrame:
+    spreads = latest.groupby('commodity').agg(
+        markets=('market', 'nunique'),
+        districts=('district', 'nunique'),
+        min_modal=('modal_price', 'min'),
+        max_modal=('modal_price', 'max'),
+        median_modal=('modal_price', 'median'),
+        lowest_min_price=('min_price', 'min'),
+        highest_max_price=('max_price', 'max')
+    )
+    spreads['spread'] = spreads['max_modal'] - spreads['min_modal']
+    spreads['spread_pct'] = spreads['spread'] / spreads['min_modal'] * 100
+
+    district_means = latest.groupby(['commodity', 'district'])['modal_price'].mean()
+    district_range = district_means.groupby(level='commodity').agg(['min', 'max'])
+    spreads['district_spread'] = district_range['max'] - district_range['min']
+
+    return spreads.sort_values('spread_pct', ascending=False)
+
+def day_over_day(frame: pd.DataFrame) -> pd.DataFrame:
+    ordered = frame.sort_values('arrival_date')
+    grouped = ordered.groupby(PRICE_KEYS, sort=False)
+    ordered = ordered.assign(previous_modal=grouped['modal_price'].shift(),
+                             previous_date=grouped['arrival_date'].shift())
+    latest = ordered.drop_duplicates(PRICE_KEYS, keep='last').dropna(subset=['previous_modal'])
+    # A market that skipped days is not compared against an older report
+    latest = latest[latest['arrival_date'] - latest['previous_date'] == pd.Timedelta(days=1)]
+    if latest.empty:
+        return pd.DataFrame(columns=['markets_reported', 'mean_change', 'mean_change_pct'])
+
+    latest = latest.assign(
+        change=latest['modal_price'] - latest['previous_modal'],
+        change_pct=(latest['modal_price'] - latest['previous_modal']) / latest['previous_modal'] * 100
+    )
+    return latest.groupby('commodity').agg(
+        markets_reported=('market', 'nunique'),
+        mean_change=('change', 'mean'),
+        mean_change_pct=('change_pct', 'mean')
+    )
+
+def arbitrage_pairs(latest: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
+    grouped = latest.groupby(['commodity', 'variety'])['modal_price']
+    counts = grouped.transform('size')
+    candidates = latest[counts > 1]
+    if candidates.empty:
+        return pd.DataFrame()
+
+    grouped = candidates.groupby(['commodity', 'variety'])['modal_price']
+    buy = candidates.loc[grouped.idxmin()].set_index(['commodity', 'variety'])
+    sell = candidates.loc[grouped.idxmax()].set_index(['commodity', 'variety'])
+
+    pairs = pd.DataFrame({
+        'buy_market': buy['market'],
+        'buy_district': buy['district'],
+        'buy_price': buy['modal_price'],
+        'sell_market': sell['market'],
+        'sell_district': sell['district'],
+        'sell_price': sell['modal_price'],
+    })
+    pairs['gap'] = pairs['sell_price'] - pairs['buy_price']
+    pairs['gap_pct'] = pairs['gap'] / pairs['buy_price'] * 100
+    pairs = pairs[pairs['gap'] > 0]
+
+    return pairs.nlargest(top_n, 'gap_pct').reset_index()
+
+def analyze_mandi_arbitrage(state_name: str = "Karnataka", commodity: Optional[str] = None, top_n: int = 10,
+                            lookback_days: int = 7) -> Dict:
+    try:
+        frame = load_price_frame(state_name, commodity, lookback_days)
+    except Exception as e:
+        logger.error(f"Failed to load mandi prices for {state_name}: {e}")
+        return {"success": False, "state": state_name, "error": f"Failed to fetch data: {e}"}
+
+    if frame.empty:
+        return {"success": False, "state": state_name, "message": f"No records found in the last {lookback_days} days"}
+
+    latest = latest_prices(frame)
+    spreads = commodity_spreads(latest).head(top_n)
+    changes = day_over_day(frame)
+    pairs = arbitrage_pairs(latest, top_n)
+
+    spreads = spreads.join(changes, how='left').round(2)
+    spreads = spreads.astype(object).where(spreads.notna(), None)
+
+    return {
+        "success": True,
+        "state": state_name,
+        "commodity": commodity,
+        "as_of": latest['arrival_date'].max().strftime("%d/%m/%Y"),
+        "records_analyzed": int(len(frame)),
+        "markets": int(latest['market'].nunique()),
+        "commodity_spreads": spreads.reset_index().to_dict(orient='records'),
+        "arbitrage_pairs": pairs.round(2).to_dict(orient='records')
+    }
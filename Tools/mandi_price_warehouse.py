@@ -0,0 +1,221 @@
+import os
+import json
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import astuple
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from Tools.mandi_bulk_loader import CHECKPOINT_PREFIX, MandiBulkLoader, MandiPriceRecord, parse_arrival_date
+except ImportError:
+    from mandi_bulk_loader import CHECKPOINT_PREFIX, MandiBulkLoader, MandiPriceRecord, parse_arrival_date
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('MANDI_PRICE_DB', os.path.join(PROJECT_ROOT, 'cache', 'mandi_prices.db'))
+
+# Beyond this gap a full reload is cheaper than one filtered load per missing day
+MAX_INCREMENTAL_DAYS = int(os.getenv('MANDI_MAX_INCREMENTAL_DAYS', 14))
+
+class MandiPriceWarehouse:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, page_size: int = 1000, max_workers: int = 8):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+        self.loader = MandiBulkLoader(self, page_size=page_size, max_workers=max_workers)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS mandi_prices (
+                    state TEXT NOT NULL COLLATE NOCASE,
+                    district TEXT NOT NULL COLLATE NOCASE,
+                    market TEXT NOT NULL COLLATE NOCASE,
+                    commodity TEXT NOT NULL COLLATE NOCASE,
+                    variety TEXT NOT NULL COLLATE NOCASE,
+                    grade TEXT NOT NULL COLLATE NOCASE,
+                    arrival_date TEXT NOT NULL,
+                    min_price REAL,
+                    max_price REAL,
+                    modal_price REAL,
+                    PRIMARY KEY (state, district, market, commodity, variety, grade, arrival_date)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_mandi_commodity_date ON mandi_prices (commodity, arrival_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_mandi_state_commodity ON mandi_prices (state, commodity, arrival_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_mandi_arrival_date ON mandi_prices (arrival_date)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS warehouse_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    def upsert(self, records: Iterable[MandiPriceRecord]) -> int:
+        rows = [astuple(record) for record in records if record is not None]
+        if not rows:
+            return 0
+
+        with self._lock, self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO mandi_prices
+                    (state, district, market, commodity, variety, grade, arrival_date, min_price, max_price, modal_price)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (state, district, market, commodity, variety, grade, arrival_date) DO UPDATE SET
+                    min_price = excluded.min_price,
+                    max_price = excluded.max_price,
+                    modal_price = excluded.modal_price
+            """, rows)
+        return len(rows)
+
+    def query(self, state: Optional[str] = None, district: Optional[str] = None,
+              market: Optional[str] = None, commodity: Optional[str] = None,
+              arrival_date: Optional[str] = None, since: Optional[str] = None,
+              latest_only: bool = True, limit: Optional[int] = None) -> List[MandiPriceRecord]:
+        filters = {'state': state, 'district': district, 'market': market, 'commodity': commodity}
+        clauses = [f"{column} = ?" for column, value in filters.items() if value]
+        params = [value.strip() for value in filters.values() if value]
+
+        if arrival_date:
+            clauses.append("arrival_date = ?")
+            params.append(parse_arrival_date(arrival_date) or arrival_date)
+        elif since:
+            clauses.append("arrival_date >= ?")
+            params.append(parse_arrival_date(since) or since)
+
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        if latest_only and not arrival_date:
+            # Only the latest reported day, so markets that stopped reporting do not surface with old prices
+            latest = f"(SELECT MAX(arrival_date) FROM mandi_prices{where})"
+            where = (where + " AND " if where else " WHERE ") + f"arrival_date = {latest}"
+            params = params * 2
+
+        query = f"SELECT * FROM mandi_prices{where}"
+
+        query += " ORDER BY arrival_date DESC, district, market, commodity"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [MandiPriceRecord(*row) for row in rows]
+
+    def count(self, state: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            if state:
+                return conn.execute("SELECT COUNT(*) FROM mandi_prices WHERE state = ?", (state.strip(),)).fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM mandi_prices").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM warehouse_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO warehouse_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def delete_meta(self, key: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM warehouse_meta WHERE key = ?", (key,))
+
+    def prune_checkpoints(self, updated_date: str) -> int:
+        # A checkpoint can only resume a load of the same feed version, so older ones are never read again
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT key, value FROM warehouse_meta WHERE key LIKE ?",
+                                (CHECKPOINT_PREFIX + '%',)).fetchall()
+            stale = [(key,) for key, value in rows if json.loads(value).get("updated_date") != updated_date]
+            conn.executemany("DELETE FROM warehouse_meta WHERE key = ?", stale)
+        return len(stale)
+
+    def load(self, filters: Optional[Dict[str, str]] = None) -> int:
+        return self.loader.load(filters)["loaded"]
+
+    def load_state(self, state_name: str) -> int:
+        return self.load({"state.keyword": state_name.strip()})
+
+    def latest_arrival_date(self) -> Optional[str]:
+        with self._connect() as conn:
+            return conn.execute("SELECT MAX(arrival_date) FROM mandi_prices").fetchone()[0]
+
+    def _load_since(self, high_water: str) -> Dict:
+        # The high-water day is reloaded too, since the feed keeps adding markets to it during the day
+        day = datetime.strptime(high_water, "%Y-%m-%d").date()
+        loaded, complete = 0, True
+        while day <= date.today():
+            stats = self.loader.load({"arrival_date": day.strftime("%d/%m/%Y")})
+            loaded += stats["loaded"]
+            complete = complete and stats["complete"]
+            day += timedelta(days=1)
+        return {"loaded": loaded, "complete": complete}
+
+    def refresh(self, force: bool = False) -> int:
+        with self._refresh_lock:
+            updated_date = self.loader.probe()["updated_date"]
+            latest_loaded = self.get_meta("updated_date")
+            self.prune_checkpoints(updated_date)
+
+            if not force and updated_date and updated_date == latest_loaded:
+                logger.info(f"Mandi price warehouse already current (updated {updated_date})")
+                return 0
+
+            high_water = None if force else self.latest_arrival_date()
+            if high_water and (date.today() - datetime.strptime(high_water, "%Y-%m-%d").date()).days <= MAX_INCREMENTAL_DAYS:
+                logger.info(f"Loading mandi prices arriving on or after {high_water}")
+                stats = self._load_since(high_water)
+            else:
+                stats = self.loader.load()
+            if stats["complete"]:
+                self.set_meta("updated_date", updated_date)
+            self.set_meta("refreshed_at", datetime.now().isoformat())
+            logger.info(f"Mandi price warehouse refreshed with {stats['loaded']} records")
+            return stats["loaded"]
+
+    def start_background_refresh(self, interval: int = 3600):
+        if self._thread and self._thread.is_alive():
+            return
+
+        def refresh_loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"Mandi price refresh failed: {e}")
+                if self._stop_event.wait(interval):
+                    break
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=refresh_loop, name="mandi-price-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self):
+        self._stop_event.set()
+
+_warehouse_instance = None
+_warehouse_lock = threading.Lock()
+
+def get_mandi_warehouse() -> MandiPriceWarehouse:
+    global _warehouse_instance
+    with _warehouse_lock:
+        if _warehouse_instance is None:
+            _warehouse_instance = MandiPriceWarehouse()
+            _warehouse_instance.start_background_refresh(int(os.getenv("MANDI_REFRESH_INTERVAL", 3600)))
+    return _warehouse_instance
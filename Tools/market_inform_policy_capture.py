@@ -7,12 +7,21 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 import json
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import feedparser
 import re
+import hashlib
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    from Tools.price_history_store import PriceHistoryStore, ExponentialSmoothingForecaster
+except ImportError:
+    from price_history_store import PriceHistoryStore, ExponentialSmoothingForecaster
 
 load_dotenv()
 
@@ -33,6 +42,18 @@ class MarketData:
     market_cap: Optional[float] = None
     pe_ratio: Optional[float] = None
     
+MARKET_COLUMNS = [
+    'commodity', 'price', 'price_change', 'volume', 'timestamp', 'source',
+    'high', 'low', 'open_price', 'market_cap', 'pe_ratio'
+]
+
+COMMODITY_GROUPS = {
+    'grains': ['WHEAT', 'RICE', 'CORN', 'BARLEY'],
+    'spices': ['TURMERIC', 'CORIANDER', 'JEERA', 'CARDAMOM'],
+    'cash_crops': ['COTTON', 'SUGAR', 'SOYBEAN'],
+    'stocks': ['UPL', 'ESCORTS', 'ITC', 'COROMANDEL']
+}
+
 @dataclass
 class PolicyData:
     policy_id: str
@@ -66,9 +87,57 @@ class MarketIntelligence:
     recommendations: List[str]
     market_trends: Dict[str, str]
     price_forecasts: Dict[str, float]
+    capture_timings: Dict[str, float] = field(default_factory=dict)
+    market_frame: Optional[pd.DataFrame] = field(default=None, repr=False)
+    version: int = 0
+    generated_at: Optional[datetime] = None
+    staleness: Dict[str, Dict] = field(default_factory=dict)
+
+@dataclass
+class SnapshotComponent:
+    value: List
+    version: int
+    refreshed_at: datetime
+    refresh_seconds: float
+    last_error: Optional[str] = None
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Token bucket needs a positive rate and capacity, got rate={rate}, capacity={capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Claim the next token without blocking and return how many seconds until it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+# Defaults follow the providers' published per-minute quotas, with a burst that covers one capture
+RATE_LIMIT_DEFAULTS = {
+    'tavily': (100 / 60, 10),
+    'serper': (5.0, 5),
+    'rss': (2.0, 4)
+}
+
+def _rate_limiter_from_env(provider: str) -> TokenBucket:
+    rate, burst = RATE_LIMIT_DEFAULTS[provider]
+    try:
+        return TokenBucket(rate=float(os.getenv(f'{provider.upper()}_RATE_LIMIT', rate)),
+                           capacity=int(os.getenv(f'{provider.upper()}_BURST', burst)))
+    except ValueError as e:
+        logger.warning(f"Ignoring {provider} rate limit settings: {e}")
+        return TokenBucket(rate=rate, capacity=burst)
 
 class MarketInformPolicyCapture:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8):
         self.api_keys = {
             'groq': os.getenv('GROQ_API_KEY'),
             'cohere': os.getenv('COHERE_API_KEY'),
@@ -98,34 +167,248 @@ class MarketInformPolicyCapture:
             'Gujarat', 'Bihar', 'Odisha', 'Assam', 'Jharkhand'
         ]
         
+        self.global_symbols = {
+            'ZW=F': 'Wheat Futures',
+            'ZC=F': 'Corn Futures', 
+            'ZS=F': 'Soybean Futures',
+            'SB=F': 'Sugar Futures',
+            'CT=F': 'Cotton Futures',
+            'CC=F': 'Cocoa Futures',
+            'KC=F': 'Coffee Futures',
+            'LBS=F': 'Lumber Futures'
+        }
+        
+        self.agri_stocks = {
+            'UPL.NS': 'UPL Limited',
+            'ESCORTS.NS': 'Escorts Limited', 
+            'COROMANDEL.NS': 'Coromandel International',
+            'ITC.NS': 'ITC Limited',
+            'NESTLEIND.NS': 'Nestle India',
+            'BRITANNIA.NS': 'Britannia Industries',
+            'PIDILITIND.NS': 'Pidilite Industries',
+            'RALLIS.NS': 'Rallis India',
+            'CHAMBLFERT.NS': 'Chambal Fertilizers',
+            'KRIBHCO.NS': 'Krishak Bharati Cooperative'
+        }
+        
+        self.etf_symbols = {
+            'DJP': 'ELEMENTS Linked to the DJ-UBS Commodity Index',
+            'DBA': 'PowerShares DB Agriculture Fund',
+            'CORN': 'Teucrium Corn Fund',
+            'SOYB': 'Teucrium Soybean Fund',
+            'WEAT': 'Teucrium Wheat Fund'
+        }
+        
+        self.tavily_queries = [
+            "agricultural policy India 2024 government announcement",
+            "farm subsidies MSP price support scheme", 
+            "crop insurance PMFBY premium reduction",
+            "kisan credit card loan interest rate",
+            "digital agriculture technology mission",
+            "organic farming certification subsidy",
+            "PM-KISAN direct benefit transfer",
+            "food processing industry policy"
+        ]
+        
+        self.serper_queries = [
+            "site:pib.gov.in agricultural policy 2024",
+            "site:agricoop.nic.in farmer scheme announcement",
+            "agricultural budget allocation India 2024"
+        ]
+        
+        self.rss_feeds = [
+            'https://pib.gov.in/RSSFeed.aspx?MINCODE=1&LANGID=1',
+            'https://www.fci.gov.in/rss.xml'
+        ]
+        
+        self.max_workers = max_workers
+        self.capture_timings: Dict[str, float] = {}
+        
+        self.rate_limiters = {provider: _rate_limiter_from_env(provider) for provider in RATE_LIMIT_DEFAULTS}
+        
+        try:
+            self.price_store = PriceHistoryStore()
+            self.price_forecaster = ExponentialSmoothingForecaster(self.price_store)
+        except Exception as e:
+            logger.warning(f"Price history store unavailable, forecasts will use latest prices only: {e}")
+            self.price_store = None
+            self.price_forecaster = None
+        
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max_workers * 2)
+        self.http_session.mount('https://', adapter)
+        self.http_session.mount('http://', adapter)
+        
         self.market_intelligence = MarketIntelligence([], [], [], {}, 0.0, [], {}, {})
     
-    def capture_real_time_market_data(self) -> List[MarketData]:
+    def capture_real_time_market_data(self, include_fundamentals: bool = False) -> List[MarketData]:
         market_data = []
+        timings = {}
         
         try:
-            nse_data = self._fetch_nse_agri_data()
-            market_data.extend(nse_data)
+            start = time.perf_counter()
+            symbols = list(self.global_symbols) + list(self.agri_stocks) + list(self.etf_symbols)
+            histories = self._fetch_price_histories(symbols)
+            timings['yahoo_history'] = round(time.perf_counter() - start, 3)
             
-            mcx_data = self._fetch_mcx_data()
-            market_data.extend(mcx_data)
+            fetchers = {
+                'NSE': lambda: self._fetch_nse_agri_data(),
+                'MCX': lambda: self._fetch_mcx_data(),
+                'Global': lambda: self._fetch_global_commodity_data(histories),
+                'Stocks': lambda: self._fetch_agri_stock_data(histories, include_fundamentals),
+                'ETF': lambda: self._fetch_commodity_futures_data(histories)
+            }
+            results = {}
             
-            global_data = self._fetch_global_commodity_data()
-            market_data.extend(global_data)
+            with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+                futures = {executor.submit(self._timed, fetcher): source for source, fetcher in fetchers.items()}
+                for future in as_completed(futures):
+                    source = futures[future]
+                    try:
+                        results[source], timings[source] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Error capturing {source} market data: {e}")
+                        results[source] = []
             
-            stock_data = self._fetch_agri_stock_data()
-            market_data.extend(stock_data)
+            for source in fetchers:
+                market_data.extend(results.get(source, []))
             
-            futures_data = self._fetch_commodity_futures_data()
-            market_data.extend(futures_data)
+            self._record_price_history(histories)
             
-            logger.info(f"Captured {len(market_data)} market data points")
+            timings['total'] = round(time.perf_counter() - start, 3)
+            logger.info(f"Captured {len(market_data)} market data points in {timings['total']}s ({timings})")
             
         except Exception as e:
             logger.error(f"Error capturing market data: {e}")
         
+        self.capture_timings = timings
         return market_data
     
+    def _symbol_commodities(self) -> Dict[str, tuple]:
+        mapping = {}
+        for symbol, name in self.global_symbols.items():
+            mapping[symbol] = (f"GLOBAL_{name.replace(' Futures', '')}", "Yahoo_Finance")
+        for symbol, name in self.agri_stocks.items():
+            mapping[symbol] = (f"STOCK_{name}", "NSE_Stock")
+        for symbol, name in self.etf_symbols.items():
+            mapping[symbol] = (f"ETF_{name}", "ETF")
+        return mapping
+    
+    def _record_price_history(self, histories: Dict[str, pd.DataFrame]):
+        if self.price_store is None:
+            return
+        
+        try:
+            mapping = self._symbol_commodities()
+            recorded = 0
+            for symbol, hist in histories.items():
+                if symbol in mapping:
+                    commodity, source = mapping[symbol]
+                    recorded += self.price_store.record_history(commodity, source, hist)
+            logger.info(f"Recorded {recorded} price history rows")
+        except Exception as e:
+            logger.warning(f"Error recording price history: {e}")
+    
+    def _timed(self, fn):
+        start = time.perf_counter()
+        result = fn()
+        return result, round(time.perf_counter() - start, 3)
+    
+    def _fetch_price_histories(self, symbols: List[str], period: str = "1mo") -> Dict[str, pd.DataFrame]:
+        histories = {}
+        
+        if not symbols:
+            return histories
+        
+        try:
+            bulk = yf.download(
+                tickers=symbols,
+                period=period,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                auto_adjust=False
+            )
+            if isinstance(bulk.columns, pd.MultiIndex):
+                available = set(bulk.columns.get_level_values(0))
+                for symbol in symbols:
+                    if symbol in available:
+                        hist = bulk[symbol].dropna(how='all')
+                        if not hist.empty:
+                            histories[symbol] = hist
+            elif len(symbols) == 1 and not bulk.empty:
+                histories[symbols[0]] = bulk.dropna(how='all')
+        except Exception as e:
+            logger.warning(f"Bulk history download failed, falling back to per-symbol requests: {e}")
+        
+        missing = [symbol for symbol in symbols if symbol not in histories]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                futures = {executor.submit(self._fetch_single_history, symbol, period): symbol for symbol in missing}
+                for future in as_completed(futures):
+                    hist = future.result()
+                    if hist is not None and not hist.empty:
+                        histories[futures[future]] = hist
+        
+        return histories
+    
+    def _fetch_single_history(self, symbol: str, period: str = "1mo") -> Optional[pd.DataFrame]:
+        try:
+            return yf.Ticker(symbol).history(period=period)
+        except Exception as e:
+            logger.warning(f"Error fetching history for {symbol}: {e}")
+            return None
+    
+    def _fetch_fundamentals(self, symbols: List[str]) -> Dict[str, Dict]:
+        fundamentals = {}
+        
+        def fetch_info(symbol):
+            try:
+                info = yf.Ticker(symbol).info
+                return {'market_cap': info.get('marketCap', None), 'pe_ratio': info.get('trailingPE', None)}
+            except Exception as e:
+                logger.warning(f"Error fetching fundamentals for {symbol}: {e}")
+                return {}
+        
+        if not symbols:
+            return fundamentals
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as executor:
+            futures = {executor.submit(fetch_info, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                fundamentals[futures[future]] = future.result()
+        
+        return fundamentals
+    
+    def _market_data_from_history(self, hist: pd.DataFrame, commodity: str, source: str,
+                                  require_previous: bool = False, market_cap: Optional[float] = None,
+                                  pe_ratio: Optional[float] = None) -> Optional[MarketData]:
+        if hist is None or hist.empty or (require_previous and len(hist) < 2):
+            return None
+        
+        current_price = hist['Close'].iloc[-1]
+        if len(hist) >= 2:
+            prev_price = hist['Close'].iloc[-2]
+            price_change = ((current_price - prev_price) / prev_price) * 100
+        else:
+            price_change = 0.0
+        
+        volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns and not pd.isna(hist['Volume'].iloc[-1]) else 0
+        
+        return MarketData(
+            commodity=commodity,
+            price=round(current_price, 2),
+            price_change=round(price_change, 2),
+            volume=volume,
+            timestamp=datetime.now(),
+            source=source,
+            high=round(hist['High'].iloc[-1], 2),
+            low=round(hist['Low'].iloc[-1], 2),
+            open_price=round(hist['Open'].iloc[-1], 2),
+            market_cap=market_cap,
+            pe_ratio=pe_ratio
+        )
+    
     def _fetch_nse_agri_data(self) -> List[MarketData]:
         data = []
         
@@ -213,46 +496,21 @@ class MarketInformPolicyCapture:
         
         return data
     
-    def _fetch_global_commodity_data(self) -> List[MarketData]:
+    def _fetch_global_commodity_data(self, histories: Optional[Dict[str, pd.DataFrame]] = None) -> List[MarketData]:
         data = []
         
-        global_symbols = {
-            'ZW=F': 'Wheat Futures',
-            'ZC=F': 'Corn Futures', 
-            'ZS=F': 'Soybean Futures',
-            'SB=F': 'Sugar Futures',
-            'CT=F': 'Cotton Futures',
-            'CC=F': 'Cocoa Futures',
-            'KC=F': 'Coffee Futures',
-            'LBS=F': 'Lumber Futures'
-        }
+        if histories is None:
+            histories = self._fetch_price_histories(list(self.global_symbols))
         
-        for symbol, name in global_symbols.items():
+        for symbol, name in self.global_symbols.items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
-                info = ticker.info
-                
-                if not hist.empty and len(hist) >= 2:
-                    current_price = hist['Close'].iloc[-1]
-                    prev_price = hist['Close'].iloc[-2]
-                    price_change = ((current_price - prev_price) / prev_price) * 100
-                    volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0
-                    high = hist['High'].iloc[-1]
-                    low = hist['Low'].iloc[-1]
-                    open_price = hist['Open'].iloc[-1]
-                    
-                    market_data = MarketData(
-                        commodity=f"GLOBAL_{name.replace(' Futures', '')}",
-                        price=round(current_price, 2),
-                        price_change=round(price_change, 2),
-                        volume=volume,
-                        timestamp=datetime.now(),
-                        source="Yahoo_Finance",
-                        high=round(high, 2),
-                        low=round(low, 2),
-                        open_price=round(open_price, 2)
-                    )
+                market_data = self._market_data_from_history(
+                    histories.get(symbol),
+                    commodity=f"GLOBAL_{name.replace(' Futures', '')}",
+                    source="Yahoo_Finance",
+                    require_previous=True
+                )
+                if market_data:
                     data.append(market_data)
                     
             except Exception as e:
@@ -260,57 +518,28 @@ class MarketInformPolicyCapture:
         
         return data
     
-    def _fetch_agri_stock_data(self) -> List[MarketData]:
+    def _fetch_agri_stock_data(self, histories: Optional[Dict[str, pd.DataFrame]] = None,
+                               include_fundamentals: bool = False) -> List[MarketData]:
         data = []
         
-        agri_stocks = {
-            'UPL.NS': 'UPL Limited',
-            'ESCORTS.NS': 'Escorts Limited', 
-            'COROMANDEL.NS': 'Coromandel International',
-            'ITC.NS': 'ITC Limited',
-            'NESTLEIND.NS': 'Nestle India',
-            'BRITANNIA.NS': 'Britannia Industries',
-            'PIDILITIND.NS': 'Pidilite Industries',
-            'RALLIS.NS': 'Rallis India',
-            'CHAMBLFERT.NS': 'Chambal Fertilizers',
-            'KRIBHCO.NS': 'Krishak Bharati Cooperative'
-        }
+        if histories is None:
+            histories = self._fetch_price_histories(list(self.agri_stocks))
         
-        for symbol, name in agri_stocks.items():
+        fundamentals = {}
+        if include_fundamentals:
+            fundamentals = self._fetch_fundamentals([symbol for symbol in self.agri_stocks if symbol in histories])
+        
+        for symbol, name in self.agri_stocks.items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
-                info = ticker.info
-                
-                if not hist.empty:
-                    current_price = hist['Close'].iloc[-1]
-                    if len(hist) >= 2:
-                        prev_price = hist['Close'].iloc[-2]
-                        price_change = ((current_price - prev_price) / prev_price) * 100
-                    else:
-                        price_change = 0.0
-                    
-                    volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0
-                    high = hist['High'].iloc[-1]
-                    low = hist['Low'].iloc[-1]
-                    open_price = hist['Open'].iloc[-1]
-                    
-                    market_cap = info.get('marketCap', None)
-                    pe_ratio = info.get('trailingPE', None)
-                    
-                    market_data = MarketData(
-                        commodity=f"STOCK_{name}",
-                        price=round(current_price, 2),
-                        price_change=round(price_change, 2),
-                        volume=volume,
-                        timestamp=datetime.now(),
-                        source="NSE_Stock",
-                        high=round(high, 2),
-                        low=round(low, 2),
-                        open_price=round(open_price, 2),
-                        market_cap=market_cap,
-                        pe_ratio=pe_ratio
-                    )
+                info = fundamentals.get(symbol, {})
+                market_data = self._market_data_from_history(
+                    histories.get(symbol),
+                    commodity=f"STOCK_{name}",
+                    source="NSE_Stock",
+                    market_cap=info.get('market_cap'),
+                    pe_ratio=info.get('pe_ratio')
+                )
+                if market_data:
                     data.append(market_data)
                     
             except Exception as e:
@@ -318,46 +547,20 @@ class MarketInformPolicyCapture:
         
         return data
     
-    def _fetch_commodity_futures_data(self) -> List[MarketData]:
+    def _fetch_commodity_futures_data(self, histories: Optional[Dict[str, pd.DataFrame]] = None) -> List[MarketData]:
         data = []
         
-        etf_symbols = {
-            'DJP': 'ELEMENTS Linked to the DJ-UBS Commodity Index',
-            'DBA': 'PowerShares DB Agriculture Fund',
-            'CORN': 'Teucrium Corn Fund',
-            'SOYB': 'Teucrium Soybean Fund',
-            'WEAT': 'Teucrium Wheat Fund'
-        }
+        if histories is None:
+            histories = self._fetch_price_histories(list(self.etf_symbols))
         
-        for symbol, name in etf_symbols.items():
+        for symbol, name in self.etf_symbols.items():
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="5d")
-                
-                if not hist.empty:
-                    current_price = hist['Close'].iloc[-1]
-                    if len(hist) >= 2:
-                        prev_price = hist['Close'].iloc[-2]
-                        price_change = ((current_price - prev_price) / prev_price) * 100
-                    else:
-                        price_change = 0.0
-                    
-                    volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0
-                    high = hist['High'].iloc[-1]
-                    low = hist['Low'].iloc[-1]
-                    open_price = hist['Open'].iloc[-1]
-                    
-                    market_data = MarketData(
-                        commodity=f"ETF_{name}",
-                        price=round(current_price, 2),
-                        price_change=round(price_change, 2),
-                        volume=volume,
-                        timestamp=datetime.now(),
-                        source="ETF",
-                        high=round(high, 2),
-                        low=round(low, 2),
-                        open_price=round(open_price, 2)
-                    )
+                market_data = self._market_data_from_history(
+                    histories.get(symbol),
+                    commodity=f"ETF_{name}",
+                    source="ETF"
+                )
+                if market_data:
                     data.append(market_data)
                     
             except Exception as e:
@@ -401,154 +604,181 @@ class MarketInformPolicyCapture:
         policy_updates = []
         
         try:
+            start = time.perf_counter()
+            tasks = [('rss', self._fetch_rss_feed, feed_url) for feed_url in self.rss_feeds]
+            
             if self.api_keys['tavily']:
-                tavily_policies = self._search_policies_tavily()
-                policy_updates.extend(tavily_policies)
+                tasks.extend(('tavily', self._tavily_policy_query, query) for query in self.tavily_queries)
             
             if self.api_keys['serper']:
-                serper_policies = self._search_policies_serper()
-                policy_updates.extend(serper_policies)
+                tasks.extend(('serper', self._serper_policy_query, query) for query in self.serper_queries)
             
-            rss_policies = self._fetch_rss_policies()
-            policy_updates.extend(rss_policies)
+            policy_updates.extend(self._run_policy_tasks(tasks))
             
             simulated_policies = self._simulate_policy_updates()
             policy_updates.extend(simulated_policies)
             
-            logger.info(f"Captured {len(policy_updates)} policy updates")
+            policy_updates = self._dedupe_policies(policy_updates)
+            logger.info(f"Captured {len(policy_updates)} policy updates in {time.perf_counter() - start:.2f}s")
             
         except Exception as e:
             logger.error(f"Error capturing policy updates: {e}")
         
         return policy_updates
     
-    def _fetch_rss_policies(self) -> List[PolicyData]:
+    def _run_policy_tasks(self, tasks) -> List[PolicyData]:
         policies = []
         
-        rss_feeds = [
-            'https://pib.gov.in/RSSFeed.aspx?MINCODE=1&LANGID=1',
-            'https://www.fci.gov.in/rss.xml'
-        ]
+        if not tasks:
+            return policies
         
-        for feed_url in rss_feeds:
-            try:
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries[:5]:
-                    if any(keyword in entry.title.lower() for keyword in ['agriculture', 'farmer', 'crop', 'food']):
-                        policy_data = PolicyData(
-                            policy_id=f"RSS_{int(time.time())}_{hash(entry.title)%1000}",
-                            title=entry.title,
-                            category=self._categorize_policy(entry.description if hasattr(entry, 'description') else ''),
-                            effective_date=datetime.now(),
-                            description=entry.description[:500] if hasattr(entry, 'description') else entry.title,
-                            impact_score=self._calculate_impact_score(entry.title + ' ' + getattr(entry, 'description', '')),
-                            affected_sectors=['agriculture', 'farming'],
-                            source_url=entry.link if hasattr(entry, 'link') else feed_url,
-                            ministry='Ministry of Agriculture'
-                        )
-                        policies.append(policy_data)
-                        
-            except Exception as e:
-                logger.warning(f"Error fetching RSS feed {feed_url}: {e}")
+        # Tokens are reserved up front and tasks are submitted when their slot opens,
+        # so throttled requests wait here instead of holding a worker thread
+        start = time.monotonic()
+        schedule = sorted(
+            ((self.rate_limiters[provider].reserve(), index, fn, arg) for index, (provider, fn, arg) in enumerate(tasks)),
+            key=lambda item: (item[0], item[1])
+        )
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            futures = []
+            for delay, _, fn, arg in schedule:
+                remaining = start + delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                futures.append(executor.submit(fn, arg))
+            for future in futures:
+                try:
+                    policies.extend(future.result())
+                except Exception as e:
+                    logger.warning(f"Policy fetch failed: {e}")
+        
+        return policies
+    
+    def _dedupe_policies(self, policies: List[PolicyData]) -> List[PolicyData]:
+        seen = set()
+        unique = []
+        
+        for policy in policies:
+            url_key = policy.source_url.strip().lower().rstrip('/') if policy.source_url else None
+            title_key = hashlib.sha1(re.sub(r'\W+', ' ', policy.title.lower()).strip().encode('utf-8')).hexdigest()
+            
+            if (url_key and url_key in seen) or title_key in seen:
+                continue
+            
+            if url_key:
+                seen.add(url_key)
+            seen.add(title_key)
+            unique.append(policy)
+        
+        return unique
+    
+    def _fetch_rss_policies(self) -> List[PolicyData]:
+        return self._run_policy_tasks([('rss', self._fetch_rss_feed, feed_url) for feed_url in self.rss_feeds])
+    
+    def _fetch_rss_feed(self, feed_url: str) -> List[PolicyData]:
+        policies = []
+        
+        try:
+            response = self.http_session.get(feed_url, timeout=15)
+            feed = feedparser.parse(response.content)
+            
+            for entry in feed.entries[:5]:
+                if any(keyword in entry.title.lower() for keyword in ['agriculture', 'farmer', 'crop', 'food']):
+                    policy_data = PolicyData(
+                        policy_id=f"RSS_{int(time.time())}_{hash(entry.title)%1000}",
+                        title=entry.title,
+                        category=self._categorize_policy(entry.description if hasattr(entry, 'description') else ''),
+                        effective_date=datetime.now(),
+                        description=entry.description[:500] if hasattr(entry, 'description') else entry.title,
+                        impact_score=self._calculate_impact_score(entry.title + ' ' + getattr(entry, 'description', '')),
+                        affected_sectors=['agriculture', 'farming'],
+                        source_url=entry.link if hasattr(entry, 'link') else feed_url,
+                        ministry='Ministry of Agriculture'
+                    )
+                    policies.append(policy_data)
+                    
+        except Exception as e:
+            logger.warning(f"Error fetching RSS feed {feed_url}: {e}")
         
         return policies
 
     def _search_policies_tavily(self) -> List[PolicyData]:
+        return self._run_policy_tasks([('tavily', self._tavily_policy_query, query) for query in self.tavily_queries])
+    
+    def _tavily_policy_query(self, query: str) -> List[PolicyData]:
         policies = []
         
         try:
             url = "https://api.tavily.com/search"
             headers = {"Authorization": f"Bearer {self.api_keys['tavily']}"}
+            payload = {
+                "query": query,
+                "search_depth": "advanced",
+                "include_answer": True,
+                "max_results": 3
+            }
             
-            search_queries = [
-                "agricultural policy India 2024 government announcement",
-                "farm subsidies MSP price support scheme", 
-                "crop insurance PMFBY premium reduction",
-                "kisan credit card loan interest rate",
-                "digital agriculture technology mission",
-                "organic farming certification subsidy",
-                "PM-KISAN direct benefit transfer",
-                "food processing industry policy"
-            ]
+            response = self.http_session.post(url, json=payload, headers=headers, timeout=15)
             
-            for query in search_queries:
-                payload = {
-                    "query": query,
-                    "search_depth": "advanced",
-                    "include_answer": True,
-                    "max_results": 3
-                }
-                
-                response = requests.post(url, json=payload, headers=headers, timeout=15)
-                
-                if response.status_code == 200:
-                    results = response.json().get('results', [])
-                    
-                    for result in results:
-                        policy_data = PolicyData(
-                            policy_id=f"TAVILY_{int(time.time())}_{hash(result.get('title', ''))%1000}",
-                            title=result.get('title', 'Unknown Policy'),
-                            category=self._categorize_policy(result.get('content', '')),
-                            effective_date=datetime.now(),
-                            description=result.get('content', '')[:500],
-                            impact_score=self._calculate_impact_score(result.get('content', '')),
-                            affected_sectors=['agriculture', 'farming'],
-                            source_url=result.get('url', ''),
-                            ministry=self._extract_ministry(result.get('content', ''))
-                        )
-                        policies.append(policy_data)
-                
-                time.sleep(2)
+            if response.status_code == 200:
+                results = response.json().get('results', [])
                 
+                for result in results:
+                    policy_data = PolicyData(
+                        policy_id=f"TAVILY_{int(time.time())}_{hash(result.get('title', ''))%1000}",
+                        title=result.get('title', 'Unknown Policy'),
+                        category=self._categorize_policy(result.get('content', '')),
+                        effective_date=datetime.now(),
+                        description=result.get('content', '')[:500],
+                        impact_score=self._calculate_impact_score(result.get('content', '')),
+                        affected_sectors=['agriculture', 'farming'],
+                        source_url=result.get('url', ''),
+                        ministry=self._extract_ministry(result.get('content', ''))
+                    )
+                    policies.append(policy_data)
+            
         except Exception as e:
-            logger.warning(f"Tavily API error: {e}")
+            logger.warning(f"Tavily API error for '{query}': {e}")
         
         return policies
     
     def _search_policies_serper(self) -> List[PolicyData]:
+        return self._run_policy_tasks([('serper', self._serper_policy_query, query) for query in self.serper_queries])
+    
+    def _serper_policy_query(self, query: str) -> List[PolicyData]:
         policies = []
         
         try:
             url = "https://google.serper.dev/search"
             headers = {"X-API-KEY": self.api_keys['serper']}
+            payload = {
+                "q": query,
+                "num": 5,
+                "gl": "in"
+            }
             
-            queries = [
-                "site:pib.gov.in agricultural policy 2024",
-                "site:agricoop.nic.in farmer scheme announcement",
-                "agricultural budget allocation India 2024"
-            ]
+            response = self.http_session.post(url, json=payload, headers=headers, timeout=10)
             
-            for query in queries:
-                payload = {
-                    "q": query,
-                    "num": 5,
-                    "gl": "in"
-                }
-                
-                response = requests.post(url, json=payload, headers=headers, timeout=10)
+            if response.status_code == 200:
+                results = response.json().get('organic', [])
                 
-                if response.status_code == 200:
-                    results = response.json().get('organic', [])
-                    
-                    for result in results:
-                        policy_data = PolicyData(
-                            policy_id=f"SERPER_{int(time.time())}_{hash(result.get('title', ''))%1000}",
-                            title=result.get('title', 'Unknown Policy'),
-                            category=self._categorize_policy(result.get('snippet', '')),
-                            effective_date=datetime.now(),
-                            description=result.get('snippet', '')[:500],
-                            impact_score=self._calculate_impact_score(result.get('snippet', '')),
-                            affected_sectors=['agriculture', 'policy'],
-                            source_url=result.get('link', ''),
-                            ministry=self._extract_ministry(result.get('snippet', ''))
-                        )
-                        policies.append(policy_data)
-                        
-                time.sleep(1)
+                for result in results:
+                    policy_data = PolicyData(
+                        policy_id=f"SERPER_{int(time.time())}_{hash(result.get('title', ''))%1000}",
+                        title=result.get('title', 'Unknown Policy'),
+                        category=self._categorize_policy(result.get('snippet', '')),
+                        effective_date=datetime.now(),
+                        description=result.get('snippet', '')[:500],
+                        impact_score=self._calculate_impact_score(result.get('snippet', '')),
+                        affected_sectors=['agriculture', 'policy'],
+                        source_url=result.get('link', ''),
+                        ministry=self._extract_ministry(result.get('snippet', ''))
+                    )
+                    policies.append(policy_data)
                     
         except Exception as e:
-            logger.warning(f"Serper API error: {e}")
+            logger.warning(f"Serper API error for '{query}': {e}")
         
         return policies
     
@@ -780,79 +1010,109 @@ class MarketInformPolicyCapture:
         
         return min(10.0, score)
 
-    def analyze_market_sentiment(self, market_data: List[MarketData]) -> float:
-        if not market_data:
+    def to_market_frame(self, market_data: Union[List[MarketData], pd.DataFrame]) -> pd.DataFrame:
+        if isinstance(market_data, pd.DataFrame):
+            return market_data
+        
+        frame = pd.DataFrame([data.__dict__ for data in market_data], columns=MARKET_COLUMNS)
+        frame['price'] = pd.to_numeric(frame['price'], errors='coerce')
+        frame['price_change'] = pd.to_numeric(frame['price_change'], errors='coerce')
+        frame['volume'] = pd.to_numeric(frame['volume'], errors='coerce').fillna(0)
+        
+        frame['source'] = frame['source'].astype('category')
+        
+        return frame
+    
+    def analyze_market_sentiment(self, market_data: Union[List[MarketData], pd.DataFrame]) -> float:
+        frame = self.to_market_frame(market_data)
+        if frame.empty:
             return 5.0
         
-        price_changes = [data.price_change for data in market_data if data.price_change is not None]
+        price_changes = frame['price_change'].dropna().to_numpy(dtype=float)
         
-        if not price_changes:
+        if not price_changes.size:
             return 5.0
         
-        avg_change = np.mean(price_changes)
-        positive_count = sum(1 for change in price_changes if change > 0)
-        negative_count = sum(1 for change in price_changes if change < 0)
-        volatility = np.std(price_changes)
+        avg_change = price_changes.mean()
+        positive_count = np.count_nonzero(price_changes > 0)
+        negative_count = np.count_nonzero(price_changes < 0)
+        volatility = price_changes.std()
         
-        sentiment = 5.0 + (avg_change * 10) + (positive_count - negative_count) / len(price_changes)
+        sentiment = 5.0 + (avg_change * 10) + (positive_count - negative_count) / price_changes.size
         
         if volatility > 3:
             sentiment -= 0.5
         
         return max(0, min(10, sentiment))
     
-    def analyze_market_trends(self, market_data: List[MarketData]) -> Dict[str, str]:
+    def analyze_market_trends(self, market_data: Union[List[MarketData], pd.DataFrame]) -> Dict[str, str]:
         trends = {}
         
-        commodity_groups = {
-            'grains': ['WHEAT', 'RICE', 'CORN', 'BARLEY'],
-            'spices': ['TURMERIC', 'CORIANDER', 'JEERA', 'CARDAMOM'],
-            'cash_crops': ['COTTON', 'SUGAR', 'SOYBEAN'],
-            'stocks': ['UPL', 'ESCORTS', 'ITC', 'COROMANDEL']
-        }
-        
-        for group, commodities in commodity_groups.items():
-            group_data = [data for data in market_data if any(commodity in data.commodity for commodity in commodities)]
-            if group_data:
-                avg_change = np.mean([data.price_change for data in group_data])
-                if avg_change > 2:
-                    trends[group] = "Strong Bullish"
-                elif avg_change > 0.5:
-                    trends[group] = "Moderately Bullish"
-                elif avg_change > -0.5:
-                    trends[group] = "Sideways"
-                elif avg_change > -2:
-                    trends[group] = "Moderately Bearish"
-                else:
-                    trends[group] = "Strong Bearish"
+        frame = self.to_market_frame(market_data)
+        if frame.empty:
+            return trends
+        
+        commodity = frame['commodity'].astype(str)
+        
+        # A commodity can belong to several groups, so each group gets its own mask
+        for group, members in COMMODITY_GROUPS.items():
+            in_group = commodity.str.contains('|'.join(map(re.escape, members)), regex=True)
+            if not in_group.any():
+                continue
+            avg_change = frame.loc[in_group, 'price_change'].mean()
+            if avg_change > 2:
+                trends[group] = "Strong Bullish"
+            elif avg_change > 0.5:
+                trends[group] = "Moderately Bullish"
+            elif avg_change > -0.5:
+                trends[group] = "Sideways"
+            elif avg_change > -2:
+                trends[group] = "Moderately Bearish"
+            else:
+                trends[group] = "Strong Bearish"
         
         return trends
     
-    def generate_price_forecasts(self, market_data: List[MarketData]) -> Dict[str, float]:
-        forecasts = {}
+    def generate_price_forecasts(self, market_data: Union[List[MarketData], pd.DataFrame],
+                                 horizon: int = 30) -> Dict[str, float]:
+        frame = self.to_market_frame(market_data)
+        if frame.empty:
+            return {}
         
-        for data in market_data[:10]:
-            price_trend = data.price_change / 100
-            volatility = np.random.uniform(0.02, 0.05)
-            
-            forecast_change = price_trend * 0.7 + np.random.uniform(-volatility, volatility)
-            forecasted_price = data.price * (1 + forecast_change)
-            
-            forecasts[data.commodity] = round(forecasted_price, 2)
+        latest = frame.drop_duplicates('commodity', keep='last').set_index('commodity')
+        model_forecasts = {}
+        
+        if self.price_forecaster is not None:
+            try:
+                model_forecasts = self.price_forecaster.forecast(list(latest.index), horizon)
+            except Exception as e:
+                logger.warning(f"Price forecasting failed, falling back to momentum estimate: {e}")
+        
+        fallback = latest['price'] * (1 + latest['price_change'].fillna(0) / 100 * 0.7)
+        
+        forecasts = {}
+        for commodity in latest.index:
+            if commodity in model_forecasts:
+                forecasts[commodity] = model_forecasts[commodity]['forecast']
+            else:
+                forecasts[commodity] = round(float(fallback[commodity]), 2)
         
         return forecasts
-
-    def calculate_risk_indicators(self, market_data: List[MarketData], 
+    
+    def calculate_risk_indicators(self, market_data: Union[List[MarketData], pd.DataFrame], 
                                  policy_data: List[PolicyData]) -> Dict[str, float]:
         risk_indicators = {}
         
-        if market_data:
-            price_changes = [abs(data.price_change) for data in market_data if data.price_change is not None]
-            volatility = np.std(price_changes) if price_changes else 0
+        frame = self.to_market_frame(market_data)
+        
+        if not frame.empty:
+            price_changes = frame['price_change'].dropna().abs().to_numpy(dtype=float)
+            volatility = price_changes.std() if price_changes.size else 0
             risk_indicators['market_volatility'] = min(10, volatility)
             
-            volume_changes = [data.volume for data in market_data if data.volume > 0]
-            avg_volume = np.mean(volume_changes) if volume_changes else 1000
+            volumes = frame['volume'].to_numpy(dtype=float)
+            volumes = volumes[volumes > 0]
+            avg_volume = volumes.mean() if volumes.size else 1000
             risk_indicators['liquidity_risk'] = max(0, min(10, 10 - (avg_volume / 1000)))
         
         policy_impact_scores = [policy.impact_score for policy in policy_data]
@@ -865,17 +1125,17 @@ class MarketInformPolicyCapture:
         
         risk_indicators['weather_risk'] = np.random.uniform(3, 8)
         
-        market_sentiment = self.analyze_market_sentiment(market_data)
+        market_sentiment = self.analyze_market_sentiment(frame)
         risk_indicators['credit_risk'] = 10 - market_sentiment
         
-        global_markets = [data for data in market_data if 'GLOBAL' in data.commodity]
-        if global_markets:
-            global_volatility = np.std([data.price_change for data in global_markets])
-            risk_indicators['global_market_risk'] = min(10, global_volatility)
+        if not frame.empty:
+            global_changes = frame.loc[frame['commodity'].str.contains('GLOBAL', regex=False), 'price_change'].to_numpy(dtype=float)
+            if global_changes.size:
+                risk_indicators['global_market_risk'] = min(10, np.std(global_changes))
         
         return risk_indicators
 
-    def generate_recommendations(self, market_data: List[MarketData], 
+    def generate_recommendations(self, market_data: Union[List[MarketData], pd.DataFrame], 
                                policy_data: List[PolicyData], 
                                risk_indicators: Dict[str, float],
                                weather_data: List[WeatherData]) -> List[str]:
@@ -931,19 +1191,17 @@ class MarketInformPolicyCapture:
         
         return recommendations
 
-    def run_comprehensive_analysis(self) -> MarketIntelligence:
-        logger.info("Starting comprehensive market and policy analysis...")
-        
-        market_data = self.capture_real_time_market_data()
-        policy_updates = self.capture_policy_updates()
-        weather_data = self.capture_weather_data()
-        risk_indicators = self.calculate_risk_indicators(market_data, policy_updates)
-        sentiment_score = self.analyze_market_sentiment(market_data)
-        market_trends = self.analyze_market_trends(market_data)
-        price_forecasts = self.generate_price_forecasts(market_data)
-        recommendations = self.generate_recommendations(market_data, policy_updates, risk_indicators, weather_data)
-        
-        self.market_intelligence = MarketIntelligence(
+    def build_market_intelligence(self, market_data: List[MarketData],
+                                  policy_updates: List[PolicyData],
+                                  weather_data: List[WeatherData]) -> MarketIntelligence:
+        market_frame = self.to_market_frame(market_data)
+        risk_indicators = self.calculate_risk_indicators(market_frame, policy_updates)
+        sentiment_score = self.analyze_market_sentiment(market_frame)
+        market_trends = self.analyze_market_trends(market_frame)
+        price_forecasts = self.generate_price_forecasts(market_frame)
+        recommendations = self.generate_recommendations(market_frame, policy_updates, risk_indicators, weather_data)
+        
+        return MarketIntelligence(
             market_data=market_data,
             policy_updates=policy_updates,
             weather_data=weather_data,
@@ -951,8 +1209,20 @@ class MarketInformPolicyCapture:
             sentiment_score=sentiment_score,
             recommendations=recommendations,
             market_trends=market_trends,
-            price_forecasts=price_forecasts
+            price_forecasts=price_forecasts,
+            capture_timings=dict(self.capture_timings),
+            market_frame=market_frame,
+            generated_at=datetime.now()
         )
+    
+    def run_comprehensive_analysis(self) -> MarketIntelligence:
+        logger.info("Starting comprehensive market and policy analysis...")
+        
+        market_data = self.capture_real_time_market_data()
+        policy_updates = self.capture_policy_updates()
+        weather_data = self.capture_weather_data()
+        
+        self.market_intelligence = self.build_market_intelligence(market_data, policy_updates, weather_data)
         
         logger.info("Comprehensive analysis completed")
         return self.market_intelligence
@@ -969,13 +1239,15 @@ class MarketInformPolicyCapture:
         print(f"\nTimestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Market Sentiment Score: {self.market_intelligence.sentiment_score:.1f}/10")
         
-        print(f"\nMarket Data Points: {len(self.market_intelligence.market_data)}")
-        if self.market_intelligence.market_data:
+        market_frame = self.market_intelligence.market_frame
+        if market_frame is None:
+            market_frame = self.to_market_frame(self.market_intelligence.market_data)
+        
+        print(f"\nMarket Data Points: {len(market_frame)}")
+        if not market_frame.empty:
             print("Top Performers:")
-            sorted_data = sorted(self.market_intelligence.market_data, 
-                               key=lambda x: x.price_change, reverse=True)[:5]
-            for data in sorted_data:
-                print(f"  • {data.commodity}: {data.price_change:+.2f}% (₹{data.price}) Vol: {data.volume:,}")
+            for data in market_frame.nlargest(5, 'price_change').itertuples(index=False):
+                print(f"  • {data.commodity}: {data.price_change:+.2f}% (₹{data.price}) Vol: {int(data.volume):,}")
         
         print(f"\nPolicy Updates: {len(self.market_intelligence.policy_updates)}")
         if self.market_intelligence.policy_updates:
@@ -1003,10 +1275,11 @@ class MarketInformPolicyCapture:
             print(f"  • {risk_type.replace('_', ' ').title()}: {score:.1f}/10 ({risk_level})")
         
         print("\nPrice Forecasts (Next 30 days):")
+        current_prices = market_frame.drop_duplicates('commodity').set_index('commodity')['price']
         for commodity, forecast in list(self.market_intelligence.price_forecasts.items())[:5]:
-            current_data = next((d for d in self.market_intelligence.market_data if d.commodity == commodity), None)
-            if current_data:
-                change = ((forecast - current_data.price) / current_data.price) * 100
+            current_price = current_prices.get(commodity)
+            if current_price:
+                change = ((forecast - current_price) / current_price) * 100
                 print(f"  • {commodity}: ₹{forecast:.2f} ({change:+.1f}%)")
         
         print("\nKey Recommendations:")
@@ -1015,6 +1288,154 @@ class MarketInformPolicyCapture:
         
         print("\n" + "="*80)
 
+class MarketIntelligenceRefresher:
+    DEFAULT_INTERVALS = {
+        'market_data': 300,
+        'policy_updates': 3600,
+        'weather_data': 1800
+    }
+    
+    def __init__(self, capture: Optional[MarketInformPolicyCapture] = None,
+                 intervals: Optional[Dict[str, int]] = None):
+        self.capture = capture or MarketInformPolicyCapture()
+        self.intervals = {**self.DEFAULT_INTERVALS, **(intervals or {})}
+        self.loaders = {
+            'market_data': self.capture.capture_real_time_market_data,
+            'policy_updates': self.capture.capture_policy_updates,
+            'weather_data': self.capture.capture_weather_data
+        }
+        
+        self._components: Dict[str, SnapshotComponent] = {}
+        self._snapshot: Optional[MarketIntelligence] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._refresh_locks = {name: threading.Lock() for name in self.loaders}
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+    
+    def start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            
+            if self._snapshot is None:
+                self.refresh_all()
+            
+            self._stop_event.clear()
+            self._threads = [
+                threading.Thread(target=self._refresh_loop, args=(name,),
+                                 name=f"market-refresh-{name}", daemon=True)
+                for name in self.loaders
+            ]
+            for thread in self._threads:
+                thread.start()
+        
+        logger.info(f"Market intelligence refresher started with intervals {self.intervals}")
+    
+    def stop(self, timeout: float = 5.0):
+        with self._start_lock:
+            self._stop_event.set()
+            for thread in self._threads:
+                thread.join(timeout=timeout)
+            self._threads = []
+    
+    def refresh_all(self):
+        with ThreadPoolExecutor(max_workers=len(self.loaders)) as executor:
+            list(executor.map(lambda name: self.refresh_component(name, publish=False), self.loaders))
+        self._publish()
+    
+    def refresh_component(self, name: str, publish: bool = True):
+        with self._refresh_locks[name]:
+            start = time.perf_counter()
+            previous = self._components.get(name)
+            
+            try:
+                value = self.loaders[name]()
+                error = None
+            except Exception as e:
+                logger.error(f"Error refreshing {name}: {e}")
+                value = previous.value if previous else []
+                error = str(e)
+            
+            with self._lock:
+                self._components[name] = SnapshotComponent(
+                    value=value,
+                    version=(previous.version + 1) if previous else 1,
+                    refreshed_at=datetime.now(),
+                    refresh_seconds=round(time.perf_counter() - start, 3),
+                    last_error=error
+                )
+        
+        if publish:
+            self._publish()
+    
+    def _refresh_loop(self, name: str):
+        while not self._stop_event.wait(self._seconds_until_due(name)):
+            self.refresh_component(name)
+    
+    def _seconds_until_due(self, name: str) -> float:
+        component = self._components.get(name)
+        if component is None:
+            return 0
+        age = (datetime.now() - component.refreshed_at).total_seconds()
+        return max(0, self.intervals[name] - age)
+    
+    def _publish(self):
+        with self._publish_lock:
+            with self._lock:
+                values = {name: component.value for name, component in self._components.items()}
+            
+            intelligence = self.capture.build_market_intelligence(
+                market_data=values.get('market_data', []),
+                policy_updates=values.get('policy_updates', []),
+                weather_data=values.get('weather_data', [])
+            )
+            
+            with self._lock:
+                self._version += 1
+                intelligence.version = self._version
+                self._snapshot = intelligence
+                self.capture.market_intelligence = intelligence
+    
+    def get_snapshot(self) -> Optional[MarketIntelligence]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return replace(snapshot, staleness=self.get_staleness())
+    
+    def get_staleness(self) -> Dict[str, Dict]:
+        now = datetime.now()
+        staleness = {}
+        for name, component in list(self._components.items()):
+            age = (now - component.refreshed_at).total_seconds()
+            staleness[name] = {
+                'version': component.version,
+                'refreshed_at': component.refreshed_at.isoformat(),
+                'age_seconds': round(age, 1),
+                'refresh_seconds': component.refresh_seconds,
+                'stale': age > self.intervals[name],
+                'last_error': component.last_error
+            }
+        return staleness
+    
+    def run_comprehensive_analysis(self, force_refresh: bool = False) -> MarketIntelligence:
+        self.start()
+        if force_refresh:
+            self.refresh_all()
+        return self.get_snapshot()
+
+_refresher_instance = None
+_refresher_lock = threading.Lock()
+
+def get_market_intelligence_refresher() -> MarketIntelligenceRefresher:
+    global _refresher_instance
+    with _refresher_lock:
+        if _refresher_instance is None:
+            _refresher_instance = MarketIntelligenceRefresher()
+    return _refresher_instance
+
 def main():
     print("Agricultural Market Information & Policy Capture System")
     print("="*80)
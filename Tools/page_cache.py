@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('SCRAPE_CACHE_DB', os.path.join(PROJECT_ROOT, 'cache', 'scrape_cache.db'))
+
+DEFAULT_TTL = int(os.getenv('SCRAPE_CACHE_TTL', 900))
+DOMAIN_TTLS = {
+    'agmarknet.gov.in': 3600,
+    'enam.gov.in': 1800,
+    'pib.gov.in': 1800,
+    'agricoop.nic.in': 6 * 3600,
+    'data.gov.in': 6 * 3600
+}
+
+@dataclass
+class CachedPage:
+    url: str
+    body: str
+    body_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    tier: str
+    fetched_at: float
+    fresh: bool
+
+class PageCache:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, default_ttl: int = DEFAULT_TTL,
+                 domain_ttls: Optional[Dict[str, int]] = None):
+        self.db_path = db_path
+        self.default_ttl = default_ttl
+        self.domain_ttls = {**DOMAIN_TTLS, **(domain_ttls or {})}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    body_hash TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    tier TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parses (
+                    url TEXT NOT NULL,
+                    selector TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    body_hash TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (url, selector, kind)
+                )
+            """)
+
+    def ttl_for(self, url: str) -> int:
+        host = urlparse(url).netloc.lower().split(':')[0]
+        for domain, ttl in self.domain_ttls.items():
+            if host == domain or host.endswith('.' + domain):
+                return ttl
+        return self.default_ttl
+
+    def get_page(self, url: str) -> Optional[CachedPage]:
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT body, body_hash, etag, last_modified, tier, fetched_at FROM pages WHERE url = ?
+            """, (url,)).fetchone()
+        if row is None:
+            return None
+
+        body, body_hash, etag, last_modified, tier, fetched_at = row
+        return CachedPage(
+            url=url,
+            body=zlib.decompress(body).decode('utf-8'),
+            body_hash=body_hash,
+            etag=etag,
+            last_modified=last_modified,
+            tier=tier,
+            fetched_at=fetched_at,
+            fresh=time.time() - fetched_at < self.ttl_for(url)
+        )
+
+    def put_page(self, url: str, body: str, tier: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> str:
+        encoded = body.encode('utf-8')
+        body_hash = hashlib.sha1(encoded).hexdigest()
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO pages (url, body, body_hash, etag, last_modified, tier, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, zlib.compress(encoded, 6), body_hash, etag, last_modified, tier, time.time()))
+        return body_hash
+
+    def touch(self, url: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def get_parse(self, url: str, selector: str, kind: str, body_hash: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT payload FROM parses WHERE url = ? AND selector = ? AND kind = ? AND body_hash = ?
+            """, (url, selector, kind, body_hash)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_parse(self, url: str, selector: str, kind: str, body_hash: str, payload: Any):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO parses (url, selector, kind, body_hash, payload)
+                VALUES (?, ?, ?, ?, ?)
+            """, (url, selector, kind, body_hash, json.dumps(payload)))
+
+    def prune(self, max_age_days: int = 7) -> int:
+        cutoff = time.time() - max_age_days * 24 * 3600
+        with self._lock, self._connect() as conn:
+            removed = conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            conn.execute("DELETE FROM parses WHERE url NOT IN (SELECT url FROM pages)")
+        return removed
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_page_cache() -> PageCache:
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = PageCache()
+            removed = _cache_instance.prune()
+            if removed:
+                logger.info(f"Pruned {removed} expired pages from the scrape cache")
+    return _cache_instance
@@ -0,0 +1,269 @@
+import os
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('PRICE_HISTORY_DB', os.path.join(PROJECT_ROOT, 'cache', 'price_history.db'))
+
+# Quotes from these feeds are simulated placeholders; older databases may still hold them
+SIMULATED_SOURCES = ('NSE', 'MCX')
+
+class PriceHistoryStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_history (
+                    commodity TEXT NOT NULL,
+                    observed_on TEXT NOT NULL,
+                    source TEXT,
+                    price REAL NOT NULL,
+                    high REAL,
+                    low REAL,
+                    open_price REAL,
+                    volume INTEGER,
+                    recorded_at TEXT NOT NULL,
+                    PRIMARY KEY (commodity, observed_on)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS forecast_params (
+                    commodity TEXT PRIMARY KEY,
+                    alpha REAL NOT NULL,
+                    beta REAL NOT NULL,
+                    level REAL NOT NULL,
+                    trend REAL NOT NULL,
+                    sse REAL NOT NULL,
+                    n_obs INTEGER NOT NULL,
+                    last_observed_on TEXT NOT NULL,
+                    fitted_at TEXT NOT NULL
+                )
+            """)
+
+    def append(self, rows: Iterable[tuple]) -> int:
+        recorded_at = datetime.now().isoformat()
+        rows = [row + (recorded_at,) for row in rows]
+        if not rows:
+            return 0
+
+        with self._lock, self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO price_history
+                    (commodity, observed_on, source, price, high, low, open_price, volume, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (commodity, observed_on) DO UPDATE SET
+                    price = excluded.price,
+                    high = excluded.high,
+                    low = excluded.low,
+                    open_price = excluded.open_price,
+                    volume = excluded.volume,
+                    recorded_at = excluded.recorded_at
+            """, rows)
+        return len(rows)
+
+    def record_history(self, commodity: str, source: str, hist: pd.DataFrame) -> int:
+        if hist is None or hist.empty:
+            return 0
+
+        rows = []
+        for observed, bar in hist.iterrows():
+            if pd.isna(bar.get('Close')):
+                continue
+            rows.append((
+                commodity,
+                pd.Timestamp(observed).strftime('%Y-%m-%d'),
+                source,
+                float(bar['Close']),
+                float(bar['High']) if not pd.isna(bar.get('High')) else None,
+                float(bar['Low']) if not pd.isna(bar.get('Low')) else None,
+                float(bar['Open']) if not pd.isna(bar.get('Open')) else None,
+                int(bar['Volume']) if not pd.isna(bar.get('Volume')) else 0
+            ))
+        return self.append(rows)
+
+    def load_prices(self, commodities: Optional[List[str]] = None, lookback_days: int = 365) -> pd.DataFrame:
+        query = (
+            "SELECT commodity, observed_on, price FROM price_history WHERE observed_on >= date('now', ?)"
+            f" AND COALESCE(source, '') NOT IN ({','.join('?' * len(SIMULATED_SOURCES))})"
+        )
+        params = [f"-{lookback_days} days", *SIMULATED_SOURCES]
+        if commodities:
+            query += f" AND commodity IN ({','.join('?' * len(commodities))})"
+            params.extend(commodities)
+
+        with self._connect() as conn:
+            rows = pd.read_sql_query(query, conn, params=params)
+
+        if rows.empty:
+            return pd.DataFrame()
+
+        rows['observed_on'] = pd.to_datetime(rows['observed_on'])
+        return rows.pivot(index='observed_on', columns='commodity', values='price').sort_index()
+
+    def rolling_statistics(self, window: int = 7, commodities: Optional[List[str]] = None) -> pd.DataFrame:
+        prices = self.load_prices(commodities)
+        if prices.empty:
+            return pd.DataFrame()
+
+        returns = prices.pct_change(fill_method=None)
+        return pd.DataFrame({
+            'last_price': prices.ffill().iloc[-1],
+            'rolling_mean': prices.rolling(window, min_periods=1).mean().iloc[-1],
+            'rolling_volatility': returns.rolling(window, min_periods=2).std().iloc[-1],
+            'observations': prices.notna().sum()
+        })
+
+    def load_params(self) -> Dict[str, Dict]:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM forecast_params").fetchall()
+        return {row['commodity']: dict(row) for row in rows}
+
+    def save_params(self, params: List[Dict]):
+        if not params:
+            return
+
+        with self._lock, self._connect() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO forecast_params
+                    (commodity, alpha, beta, level, trend, sse, n_obs, last_observed_on, fitted_at)
+                VALUES (:commodity, :alpha, :beta, :level, :trend, :sse, :n_obs, :last_observed_on, :fitted_at)
+            """, params)
+
+class ExponentialSmoothingForecaster:
+    ALPHAS = np.linspace(0.1, 0.9, 9)
+    BETAS = np.array([0.01, 0.05, 0.1, 0.2, 0.3])
+
+    def __init__(self, store: PriceHistoryStore, damping: float = 0.9, min_observations: int = 3):
+        self.store = store
+        self.damping = damping
+        self.min_observations = min_observations
+
+    def fit(self, prices: pd.DataFrame) -> List[Dict]:
+        values = prices.ffill().to_numpy(dtype=float)
+        n_steps, n_series = values.shape
+
+        alpha_grid, beta_grid = np.meshgrid(self.ALPHAS, self.BETAS, indexing='ij')
+        alpha = alpha_grid.reshape(-1, 1)
+        beta = beta_grid.reshape(-1, 1)
+        n_grid = alpha.shape[0]
+
+        valid = ~np.isnan(values)
+        first = valid.argmax(axis=0)
+
+        level = np.zeros((n_grid, n_series))
+        trend = np.zeros((n_grid, n_series))
+        sse = np.zeros((n_grid, n_series))
+        phi = self.damping
+
+        for t in range(n_steps):
+            y = values[t]
+            started = t > first
+            initial = t == first
+
+            predicted = level + phi * trend
+            error = np.where(started, y - predicted, 0.0)
+            sse += error ** 2
+
+            new_level = alpha * y + (1 - alpha) * predicted
+            new_trend = beta * (new_level - level) + (1 - beta) * phi * trend
+
+            level = np.where(started, new_level, np.where(initial, y, level))
+            trend = np.where(started, new_trend, trend)
+
+        best = sse.argmin(axis=0)
+        columns = np.arange(n_series)
+        fitted_at = datetime.now().isoformat()
+        last_observed = prices.apply(lambda series: series.last_valid_index())
+        # Counted before the forward fill, the same way forecast() counts them when deciding to refit
+        observations = prices.notna().sum()
+
+        return [
+            {
+                'commodity': commodity,
+                'alpha': float(alpha[best[i], 0]),
+                'beta': float(beta[best[i], 0]),
+                'level': float(level[best[i], i]),
+                'trend': float(trend[best[i], i]),
+                'sse': float(sse[best[i], i]),
+                'n_obs': int(observations[commodity]),
+                'last_observed_on': last_observed[commodity].strftime('%Y-%m-%d'),
+                'fitted_at': fitted_at
+            }
+            for i, commodity in zip(columns, prices.columns)
+        ]
+
+    def forecast(self, commodities: List[str], horizon: int = 30) -> Dict[str, Dict]:
+        prices = self.store.load_prices(commodities)
+        if prices.empty:
+            return {}
+
+        observations = prices.notna().sum()
+        prices = prices.loc[:, observations[observations >= self.min_observations].index]
+        if prices.empty:
+            return {}
+
+        cached = self.store.load_params()
+        last_observed = prices.apply(lambda series: series.last_valid_index().strftime('%Y-%m-%d'))
+        stale = [
+            commodity for commodity in prices.columns
+            if commodity not in cached
+            or cached[commodity]['last_observed_on'] != last_observed[commodity]
+            or cached[commodity]['n_obs'] != int(observations[commodity])
+        ]
+
+        if stale:
+            refitted = self.fit(prices[stale])
+            self.store.save_params(refitted)
+            cached.update({params['commodity']: params for params in refitted})
+
+        phi = self.damping
+        damped_steps = phi * (1 - phi ** horizon) / (1 - phi) if phi < 1 else horizon
+        returns = prices.pct_change(fill_method=None)
+        drift = returns.mean().abs()
+        volatility = returns.std()
+
+        forecasts = {}
+        for commodity in prices.columns:
+            params = cached[commodity]
+            last_price = prices[commodity].dropna().iloc[-1]
+            point = params['level'] + params['trend'] * damped_steps
+
+            if not np.isnan(volatility.get(commodity, np.nan)):
+                limit = (drift[commodity] * horizon + 3 * volatility[commodity] * np.sqrt(horizon)) * last_price
+                point = float(np.clip(point, last_price - limit, last_price + limit))
+
+            forecasts[commodity] = {
+                'forecast': round(point, 2),
+                'level': round(params['level'], 2),
+                'trend': round(params['trend'], 4),
+                'alpha': params['alpha'],
+                'beta': params['beta'],
+                'observations': params['n_obs']
+            }
+
+        return forecasts
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('RISK_INDICATOR_DB', os.path.join(PROJECT_ROOT, 'cache', 'risk_indicators.db'))
+
+DEFAULT_TTLS = {
+    'market': 12 * 3600,
+    'weather': 24 * 3600,
+    'financial': 7 * 24 * 3600,
+    'operational': 7 * 24 * 3600
+}
+
+def _ttls_from_env() -> Dict[str, int]:
+    ttls = dict(DEFAULT_TTLS)
+    for family in ttls:
+        value = os.getenv(f"RISK_{family.upper()}_TTL")
+        if value:
+            ttls[family] = int(value)
+    return ttls
+
+class RiskIndicatorCache:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, ttls: Optional[Dict[str, int]] = None,
+                 stale_factor: float = 4.0):
+        self.db_path = db_path
+        self.ttls = {**_ttls_from_env(), **(ttls or {})}
+        self.stale_factor = stale_factor
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._lock, self._connect() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(risk_indicators)").fetchall()]
+            if 'bucket' in columns:
+                # Earlier versions kept one row per day; the cache is disposable, so start over
+                conn.execute("DROP TABLE risk_indicators")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS risk_indicators (
+                    commodity TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (commodity, family)
+                )
+            """)
+
+    def _key(self, commodity: str) -> str:
+        return commodity.strip().lower()
+
+    def get(self, commodity: str, family: str) -> Optional[Tuple[Dict, float]]:
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT payload, fetched_at FROM risk_indicators WHERE commodity = ? AND family = ?
+            """, (self._key(commodity), family)).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def put(self, commodity: str, family: str, values: Dict):
+        fetched_at = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                INSERT INTO risk_indicators (commodity, family, payload, fetched_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (commodity, family) DO UPDATE SET
+                    payload = excluded.payload,
+                    fetched_at = excluded.fetched_at
+            """, (self._key(commodity), family, json.dumps(values), fetched_at))
+
+    def lookup(self, commodity: str, family: str) -> Tuple[Optional[Dict], str]:
+        entry = self.get(commodity, family)
+        if entry is None:
+            return None, 'missing'
+
+        values, age = entry
+        ttl = self.ttls.get(family, DEFAULT_TTLS['market'])
+        if age < ttl:
+            return values, 'fresh'
+        if age < ttl * self.stale_factor:
+            return values, 'stale'
+        return None, 'expired'
+
+    def prune(self, keep_days: int = 30) -> int:
+        cutoff = time.time() - keep_days * 24 * 3600
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM risk_indicators WHERE fetched_at < ?", (cutoff,)).rowcount
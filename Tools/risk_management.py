@@ -1,9 +1,19 @@
 import numpy as np
 import requests
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+
+try:
+    from Tools.risk_indicator_cache import RiskIndicatorCache
+except ImportError:
+    from risk_indicator_cache import RiskIndicatorCache
+
+TOP_COMMODITIES = ['wheat', 'rice', 'corn', 'soybeans', 'cotton', 'sugarcane', 'pulses', 'onion', 'potato', 'tomato']
 
 @dataclass
 class RiskMetric:
@@ -13,28 +23,131 @@ class RiskMetric:
     confidence: float
 
 class RealTimeDataFetcher:
-    def __init__(self):
+    def __init__(self, deadline: float = 20.0, max_workers: int = 8,
+                 cache: Optional[RiskIndicatorCache] = None):
         self.api_keys = {
             'tavily': os.getenv('TAVILY_API_KEY'),
             'serper': os.getenv('SERPER_API_KEY'), 
             'google': os.getenv('GOOGLE_API_KEY')
         }
+        self.deadline = deadline
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="risk-indicators")
+        
+        self.cache = cache if cache is not None else RiskIndicatorCache()
+        self.indicator_families = {
+            'market': (self._fetch_market_indicators, self._get_default_market_data),
+            'weather': (self._fetch_weather_indicators, self._get_default_weather_data),
+            'financial': (self._fetch_financial_indicators, self._get_default_financial_data),
+            'operational': (self._fetch_operational_indicators, self._get_default_operational_data)
+        }
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        self._warmup_stop = threading.Event()
+        self._warmup_thread: Optional[threading.Thread] = None
 
-    def fetch_complete_portfolio_data(self, commodity: str) -> Dict:
-        portfolio_data = {"primary_commodity": commodity}
+    def _fetch_and_cache(self, commodity: str, family: str) -> Optional[Dict]:
+        values = self.indicator_families[family][0](commodity)
+        if values is not None:
+            self.cache.put(commodity, family, values)
+        return values
 
-        market_data = self._fetch_market_indicators(commodity)
-        weather_data = self._fetch_weather_indicators(commodity)
-        financial_data = self._fetch_financial_indicators(commodity)
-        operational_data = self._fetch_operational_indicators(commodity)
+    def _revalidate(self, commodity: str, family: str):
+        key = (commodity.strip().lower(), family)
+        with self._revalidate_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        
+        def done(_):
+            with self._revalidate_lock:
+                self._revalidating.discard(key)
+        
+        self.executor.submit(self._fetch_and_cache, commodity, family).add_done_callback(done)
 
-        portfolio_data.update(market_data)
-        portfolio_data.update(weather_data)
-        portfolio_data.update(financial_data)
-        portfolio_data.update(operational_data)
+    def fetch_complete_portfolio_data(self, commodity: str, deadline: Optional[float] = None) -> Dict:
+        portfolio_data = {"primary_commodity": commodity}
+        
+        futures = {}
+        stale = []
+        for family in self.indicator_families:
+            values, state = self.cache.lookup(commodity, family)
+            if values is not None:
+                portfolio_data.update(values)
+                if state == 'stale':
+                    stale.append(family)
+                    self._revalidate(commodity, family)
+            else:
+                futures[family] = self.executor.submit(self._fetch_and_cache, commodity, family)
+        
+        if futures:
+            wait(futures.values(), timeout=deadline if deadline is not None else self.deadline)
+        
+        defaulted = []
+        for family, future in futures.items():
+            if future.done() and future.exception() is None and future.result() is not None:
+                portfolio_data.update(future.result())
+            else:
+                future.cancel()
+                defaulted.append(family)
+                portfolio_data.update(self.indicator_families[family][1](commodity))
+        
+        if defaulted:
+            print(f"Indicator fetch fell back to defaults for {commodity}: {', '.join(defaulted)}")
+        portfolio_data['defaulted_indicators'] = defaulted
+        portfolio_data['stale_indicators'] = stale
         
         return portfolio_data
 
+    def warm_up(self, commodities: Optional[List[str]] = None) -> Dict[str, int]:
+        refreshed = {}
+        if not (self.api_keys['serper'] or self.api_keys['tavily']):
+            return refreshed
+        
+        targets = [
+            (commodity, family)
+            for commodity in commodities or TOP_COMMODITIES
+            for family in self.indicator_families
+            if self.cache.lookup(commodity, family)[1] != 'fresh'
+        ]
+        
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="risk-warmup") as executor:
+            futures = {target: executor.submit(self._fetch_and_cache, *target) for target in targets}
+        
+        for (commodity, family), future in futures.items():
+            try:
+                if future.result() is not None:
+                    refreshed[commodity] = refreshed.get(commodity, 0) + 1
+            except Exception as e:
+                print(f"Indicator warm-up failed for {commodity}/{family}: {e}")
+        
+        return refreshed
+
+    def start_warmup(self, commodities: Optional[List[str]] = None, interval: Optional[int] = None):
+        if self._warmup_thread and self._warmup_thread.is_alive():
+            return
+        interval = interval or min(self.cache.ttls.values())
+        
+        def warmup_loop():
+            while True:
+                try:
+                    self.warm_up(commodities)
+                    self.cache.prune()
+                except Exception as e:
+                    print(f"Indicator warm-up failed: {e}")
+                if self._warmup_stop.wait(interval):
+                    break
+        
+        self._warmup_stop.clear()
+        self._warmup_thread = threading.Thread(target=warmup_loop, name="risk-indicator-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def stop_warmup(self):
+        self._warmup_stop.set()
+
     def _fetch_market_indicators(self, commodity: str) -> Dict:
         try:
             if self.api_keys['serper']:
@@ -45,7 +158,7 @@ class RealTimeDataFetcher:
                     'type': 'search'
                 }
                 
-                response = requests.post('https://google.serper.dev/search', 
+                response = self.session.post('https://google.serper.dev/search', 
                                        headers=headers, json=payload, timeout=15)
                 
                 if response.status_code == 200:
@@ -60,7 +173,7 @@ class RealTimeDataFetcher:
                     'max_results': 8
                 }
                 
-                response = requests.post('https://api.tavily.com/search',
+                response = self.session.post('https://api.tavily.com/search',
                                        headers=headers, json=payload, timeout=15)
                 
                 if response.status_code == 200:
@@ -69,7 +182,7 @@ class RealTimeDataFetcher:
         except Exception as e:
             print(f"Market data fetch error: {e}")
             
-        return self._get_default_market_data(commodity)
+        return None
 
     def _fetch_weather_indicators(self, commodity: str) -> Dict:
         try:
@@ -81,7 +194,7 @@ class RealTimeDataFetcher:
                     'type': 'search'
                 }
                 
-                response = requests.post('https://google.serper.dev/search', 
+                response = self.session.post('https://google.serper.dev/search', 
                                        headers=headers, json=payload, timeout=15)
                 
                 if response.status_code == 200:
@@ -90,7 +203,7 @@ class RealTimeDataFetcher:
         except Exception as e:
             print(f"Weather data fetch error: {e}")
             
-        return self._get_default_weather_data(commodity)
+        return None
 
     def _fetch_financial_indicators(self, commodity: str) -> Dict:
         try:
@@ -102,7 +215,7 @@ class RealTimeDataFetcher:
                     'type': 'search'
                 }
                 
-                response = requests.post('https://google.serper.dev/search', 
+                response = self.session.post('https://google.serper.dev/search', 
                                        headers=headers, json=payload, timeout=15)
                 
                 if response.status_code == 200:
@@ -111,7 +224,7 @@ class RealTimeDataFetcher:
         except Exception as e:
             print(f"Financial data fetch error: {e}")
             
-        return self._get_default_financial_data(commodity)
+        return None
 
     def _fetch_operational_indicators(self, commodity: str) -> Dict:
         try:
@@ -123,7 +236,7 @@ class RealTimeDataFetcher:
                     'type': 'search'
                 }
                 
-                response = requests.post('https://google.serper.dev/search', 
+                response = self.session.post('https://google.serper.dev/search', 
                                        headers=headers, json=payload, timeout=15)
                 
                 if response.status_code == 200:
@@ -132,7 +245,7 @@ class RealTimeDataFetcher:
         except Exception as e:
             print(f"Operational data fetch error: {e}")
             
-        return self._get_default_operational_data(commodity)
+        return None
 
     def _parse_market_indicators(self, results: Dict) -> Dict:
         volatility_score = 0.5
@@ -279,87 +392,235 @@ class RealTimeDataFetcher:
             'tech_resilience': 0.75
         }
 
+RISK_FACTORS = [
+    'volatility_index', 'price_elasticity', 'precipitation_cv', 'temp_anomaly_std',
+    'geographic_diversity', 'debt_ratio', 'liquidity_ratio', 'supply_complexity', 'tech_resilience'
+]
+
+FACTOR_DEFAULTS = {
+    'volatility_index': 0.5,
+    'price_elasticity': -1.2,
+    'precipitation_cv': 0.3,
+    'temp_anomaly_std': 1.5,
+    'geographic_diversity': 0.5,
+    'debt_ratio': 0.4,
+    'liquidity_ratio': 1.2,
+    'supply_complexity': 0.5,
+    'tech_resilience': 0.7
+}
+
+RISK_COMPONENTS = ['market', 'weather', 'financial', 'operational']
+
+# component, shock scale per unit standard normal, direction that increases risk
+FACTOR_SHOCKS = {
+    'volatility_index': ('market', 0.12, 1),
+    'price_elasticity': ('market', 0.30, -1),
+    'precipitation_cv': ('weather', 0.10, 1),
+    'temp_anomaly_std': ('weather', 0.60, 1),
+    'geographic_diversity': ('weather', 0.05, -1),
+    'debt_ratio': ('financial', 0.08, 1),
+    'liquidity_ratio': ('financial', 0.20, -1),
+    'supply_complexity': ('operational', 0.08, 1),
+    'tech_resilience': ('operational', 0.05, -1)
+}
+
+FACTOR_BOUNDS = {
+    'volatility_index': (0.0, 1.0),
+    'price_elasticity': (-3.0, -0.1),
+    'precipitation_cv': (0.0, 1.0),
+    'temp_anomaly_std': (0.0, 5.0),
+    'geographic_diversity': (0.0, 1.0),
+    'debt_ratio': (0.0, 1.0),
+    'liquidity_ratio': (0.1, 3.0),
+    'supply_complexity': (0.0, 1.0),
+    'tech_resilience': (0.0, 1.0)
+}
+
+def position_key(commodity: str, region: Optional[str] = None) -> tuple:
+    return commodity.strip().lower(), region.strip().lower() if region else None
+
+def _sigmoid_matrix(x: np.ndarray, k: float, x0: float) -> np.ndarray:
+    return 1 / (1 + np.exp(-k * (x - x0)))
+
+def risk_matrix(indicators: np.ndarray) -> np.ndarray:
+    factor = {name: indicators[:, i] for i, name in enumerate(RISK_FACTORS)}
+    
+    normalized_elasticity = np.minimum(1.0, np.abs(factor['price_elasticity']) / 2.0)
+    market_exposure = 0.7 * factor['volatility_index'] + 0.3 * normalized_elasticity
+    market = _sigmoid_matrix(market_exposure, k=8, x0=0.4)
+    
+    climate_stress = np.sqrt((factor['precipitation_cv'] ** 2 + (factor['temp_anomaly_std'] / 3.0) ** 2) / 2)
+    weather = np.minimum(1.0, climate_stress * (1.0 - factor['geographic_diversity'] * 0.3))
+    
+    leverage_risk = _sigmoid_matrix(factor['debt_ratio'], k=12, x0=0.6)
+    liquidity_risk = np.maximum(0, (1.5 - factor['liquidity_ratio']) / 1.5)
+    financial = np.minimum(1.0, np.sqrt(leverage_risk ** 2 + liquidity_risk ** 2))
+    
+    complexity_penalty = factor['supply_complexity'] ** 1.5
+    tech_bonus = 1.0 - factor['tech_resilience'] * 0.4
+    operational = np.minimum(1.0, 0.6 * complexity_penalty + 0.4 * tech_bonus)
+    
+    return np.column_stack([market, weather, financial, operational])
+
+def overall_risk_batch(risks: np.ndarray, weight_vector: np.ndarray, correlation_matrix: np.ndarray) -> np.ndarray:
+    weighted = risks ** 2 * weight_vector
+    variance = (weighted @ correlation_matrix.T) @ weight_vector
+    return np.minimum(1.0, np.sqrt(variance))
+
+def simulate_scenario_paths(base: np.ndarray, correlation_matrix: np.ndarray, weight_vector: np.ndarray,
+                            n_paths: int, shock_scale: float = 1.0, factor_loading: float = 0.8,
+                            seed=None) -> tuple:
+    rng = np.random.default_rng(seed)
+    chol = np.linalg.cholesky(correlation_matrix)
+    
+    component_index = np.array([RISK_COMPONENTS.index(FACTOR_SHOCKS[name][0]) for name in RISK_FACTORS])
+    scales = np.array([FACTOR_SHOCKS[name][1] * FACTOR_SHOCKS[name][2] for name in RISK_FACTORS]) * shock_scale
+    lower = np.array([FACTOR_BOUNDS[name][0] for name in RISK_FACTORS])
+    upper = np.array([FACTOR_BOUNDS[name][1] for name in RISK_FACTORS])
+    
+    component_shocks = rng.standard_normal((n_paths, len(RISK_COMPONENTS))) @ chol.T
+    idiosyncratic = rng.standard_normal((n_paths, len(RISK_FACTORS)))
+    shocks = factor_loading * component_shocks[:, component_index] + np.sqrt(1 - factor_loading ** 2) * idiosyncratic
+    
+    indicators = np.clip(base + shocks * scales, lower, upper)
+    risks = risk_matrix(indicators)
+    return risks, overall_risk_batch(risks, weight_vector, correlation_matrix)
+
 class AgriculturalRiskCalculator:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4):
         self.weights = {
             'market': 0.35,
             'weather': 0.30,
             'financial': 0.25,
             'operational': 0.10
         }
+        self.weight_vector = np.array([self.weights[component] for component in RISK_COMPONENTS])
+        self.correlation_matrix = np.array([
+            [1.00, 0.25, 0.40, 0.15],
+            [0.25, 1.00, 0.20, 0.30],
+            [0.40, 0.20, 1.00, 0.35],
+            [0.15, 0.30, 0.35, 1.00]
+        ])
         self.data_fetcher = RealTimeDataFetcher()
+        self.max_workers = max_workers
         
-    def _sigmoid_transform(self, x: float, k: float = 10, x0: float = 0.5) -> float:
-        return 1 / (1 + np.exp(-k * (x - x0)))
+    def calculate_risk_matrix(self, indicators: np.ndarray) -> np.ndarray:
+        return risk_matrix(indicators)
     
-    def _calculate_market_risk(self, portfolio: Dict) -> float:
-        volatility = portfolio.get('volatility_index', 0.5)
-        price_elasticity = portfolio.get('price_elasticity', -1.2)
-        
-        normalized_elasticity = min(1.0, abs(price_elasticity) / 2.0)
-        market_exposure = 0.7 * volatility + 0.3 * normalized_elasticity
-        
-        return self._sigmoid_transform(market_exposure, k=8, x0=0.4)
+    def calculate_overall_risk_batch(self, risks: np.ndarray) -> np.ndarray:
+        return overall_risk_batch(risks, self.weight_vector, self.correlation_matrix)
     
-    def _calculate_weather_risk(self, portfolio: Dict) -> float:
-        precipitation_variance = portfolio.get('precipitation_cv', 0.3)
-        temperature_anomaly = portfolio.get('temp_anomaly_std', 1.5)
-        
-        climate_stress = np.sqrt(
-            (precipitation_variance ** 2 + (temperature_anomaly / 3.0) ** 2) / 2
-        )
-        
-        geographic_factor = 1.0 - portfolio.get('geographic_diversity', 0.5) * 0.3
-        weather_risk = climate_stress * geographic_factor
-        
-        return min(1.0, weather_risk)
+    def get_indicators(self, commodity: str, region: Optional[str] = None) -> Dict:
+        # The region goes into the search subject, so indicators are fetched and cached per (commodity, region)
+        subject = f"{commodity} {region}" if region else commodity
+        return self.data_fetcher.fetch_complete_portfolio_data(subject)
     
-    def _calculate_financial_risk(self, portfolio: Dict) -> float:
-        debt_ratio = portfolio.get('debt_ratio', 0.4)
-        liquidity_ratio = portfolio.get('liquidity_ratio', 1.2)
+    def build_indicator_matrix(self, keys: List[tuple]) -> np.ndarray:
+        unique = list(dict.fromkeys(keys))
         
-        leverage_risk = self._sigmoid_transform(debt_ratio, k=12, x0=0.6)
-        liquidity_risk = max(0, (1.5 - liquidity_ratio) / 1.5)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(unique)))) as executor:
+            indicators = dict(zip(unique, executor.map(lambda key: self.get_indicators(*key), unique)))
         
-        financial_risk = np.sqrt(leverage_risk ** 2 + liquidity_risk ** 2)
-        return min(1.0, financial_risk)
+        return np.array([
+            [indicators[key].get(name, FACTOR_DEFAULTS[name]) for name in RISK_FACTORS]
+            for key in keys
+        ], dtype=float)
     
-    def _calculate_operational_risk(self, portfolio: Dict) -> float:
-        supply_complexity = portfolio.get('supply_complexity', 0.5)
-        tech_resilience = portfolio.get('tech_resilience', 0.7)
-        
-        complexity_penalty = supply_complexity ** 1.5
-        tech_bonus = 1.0 - tech_resilience * 0.4
+    def calculate_portfolio_risk(self, positions: List[Dict],
+                                 commodity_correlation: Optional[np.ndarray] = None,
+                                 default_correlation: float = 0.3, regional_correlation: float = 0.7) -> Dict:
+        keys = [position_key(position['commodity'], position.get('region')) for position in positions]
+        exposures = np.array([float(position.get('exposure', 1.0)) for position in positions])
+        
+        indicators = self.build_indicator_matrix(keys)
+        risks = self.calculate_risk_matrix(indicators)
+        overall = self.calculate_overall_risk_batch(risks)
+        
+        if commodity_correlation is None:
+            commodities = np.array([commodity for commodity, _ in keys])
+            regions = np.array([region or "" for _, region in keys])
+            same_commodity = commodities[:, None] == commodities[None, :]
+            same_region = regions[:, None] == regions[None, :]
+            commodity_correlation = np.where(same_commodity & same_region, 1.0,
+                                             np.where(same_commodity, regional_correlation, default_correlation))
+        
+        weights = exposures / exposures.sum() if exposures.sum() > 0 else np.full(len(positions), 1 / len(positions))
+        weighted_risk = weights * overall
+        portfolio_risk = float(np.sqrt(weighted_risk @ commodity_correlation @ weighted_risk))
+        standalone_risk = float(weighted_risk.sum())
+        
+        order = np.argsort(-overall)
+        ranked = [
+            {
+                "rank": rank + 1,
+                "commodity": positions[i]['commodity'],
+                "region": positions[i].get('region'),
+                "exposure": float(exposures[i]),
+                "overall_risk": round(float(overall[i]), 3),
+                "level": self._get_risk_level(overall[i]),
+                **{f"{component}_risk": round(float(risks[i, j]), 3) for j, component in enumerate(RISK_COMPONENTS)},
+                "risk_contribution": round(float(weighted_risk[i] * (commodity_correlation[i] @ weighted_risk) / portfolio_risk), 4) if portfolio_risk > 0 else 0.0
+            }
+            for rank, i in enumerate(order)
+        ]
         
-        operational_risk = 0.6 * complexity_penalty + 0.4 * tech_bonus
-        return min(1.0, operational_risk)
+        return {
+            "positions": ranked,
+            "portfolio_risk": round(portfolio_risk, 3),
+            "portfolio_level": self._get_risk_level(portfolio_risk),
+            "standalone_weighted_risk": round(standalone_risk, 3),
+            "diversification_benefit": round(1 - portfolio_risk / standalone_risk, 3) if standalone_risk > 0 else 0.0
+        }
     
-    def _calculate_overall_risk(self, individual_risks: Dict) -> float:
-        risk_vector = np.array([
-            individual_risks['market'],
-            individual_risks['weather'], 
-            individual_risks['financial'],
-            individual_risks['operational']
-        ])
+    def simulate_scenarios(self, commodity: str, n_paths: int = 100_000, shock_scale: float = 1.0,
+                           thresholds: Optional[Dict[str, float]] = None, seed: Optional[int] = None,
+                           processes: int = 1) -> Dict:
+        thresholds = thresholds or {"High": 0.6, "Critical": 0.8}
+        portfolio = self.get_indicators(commodity)
+        base = np.array([portfolio.get(name, FACTOR_DEFAULTS[name]) for name in RISK_FACTORS], dtype=float)
+        
+        if processes > 1 and n_paths >= 2 * processes:
+            chunks = np.array_split(np.arange(n_paths), processes)
+            seeds = np.random.SeedSequence(seed).spawn(processes)
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(
+                    simulate_scenario_paths,
+                    [base] * processes, [self.correlation_matrix] * processes, [self.weight_vector] * processes,
+                    [len(chunk) for chunk in chunks], [shock_scale] * processes, [0.8] * processes, seeds
+                ))
+            risks = np.concatenate([result[0] for result in results])
+            overall = np.concatenate([result[1] for result in results])
+        else:
+            risks, overall = simulate_scenario_paths(base, self.correlation_matrix, self.weight_vector,
+                                                     n_paths, shock_scale, seed=seed)
+        
+        base_risks = self.calculate_risk_matrix(base[None, :])
+        base_overall = float(self.calculate_overall_risk_batch(base_risks)[0])
+        
+        def distribution(values: np.ndarray) -> Dict:
+            p50, p90, p95, p99 = np.quantile(values, [0.5, 0.9, 0.95, 0.99])
+            return {
+                "mean": round(float(values.mean()), 4),
+                "std": round(float(values.std()), 4),
+                "p50": round(float(p50), 4),
+                "p90": round(float(p90), 4),
+                "var_95": round(float(p95), 4),
+                "var_99": round(float(p99), 4),
+                "cvar_95": round(float(values[values >= p95].mean()), 4),
+                "cvar_99": round(float(values[values >= p99].mean()), 4),
+                **{f"prob_{level.lower()}": round(float((values > limit).mean()), 4) for level, limit in thresholds.items()}
+            }
         
-        weight_vector = np.array([
-            self.weights['market'],
-            self.weights['weather'],
-            self.weights['financial'], 
-            self.weights['operational']
-        ])
-        
-        correlation_matrix = np.array([
-            [1.00, 0.25, 0.40, 0.15],
-            [0.25, 1.00, 0.20, 0.30],
-            [0.40, 0.20, 1.00, 0.35],
-            [0.15, 0.30, 0.35, 1.00]
-        ])
-        
-        portfolio_variance = np.dot(weight_vector, np.dot(correlation_matrix, 
-                                   weight_vector * risk_vector ** 2))
-        
-        return min(1.0, np.sqrt(portfolio_variance))
+        return {
+            "commodity": commodity,
+            "paths": int(n_paths),
+            "shock_scale": shock_scale,
+            "baseline_risk": round(base_overall, 4),
+            "baseline_level": self._get_risk_level(base_overall),
+            "overall": distribution(overall),
+            "components": {component: distribution(risks[:, j]) for j, component in enumerate(RISK_COMPONENTS)},
+            "defaulted_indicators": portfolio.get('defaulted_indicators', [])
+        }
     
     def _get_risk_level(self, risk_score: float) -> str:
         thresholds = [(0.2, "Very Low"), (0.4, "Low"), (0.6, "Moderate"), 
@@ -382,15 +643,11 @@ class AgriculturalRiskCalculator:
         return data_quality_scores.get(risk_type, 0.75)
     
     def calculate_risk_metrics(self, commodity: str) -> List[RiskMetric]:
-        portfolio = self.data_fetcher.fetch_complete_portfolio_data(commodity)
-        individual_risks = {
-            'market': self._calculate_market_risk(portfolio),
-            'weather': self._calculate_weather_risk(portfolio),
-            'financial': self._calculate_financial_risk(portfolio),
-            'operational': self._calculate_operational_risk(portfolio)
-        }
-        
-        overall_risk = self._calculate_overall_risk(individual_risks)
+        portfolio = self.get_indicators(commodity)
+        indicators = np.array([[portfolio.get(name, FACTOR_DEFAULTS[name]) for name in RISK_FACTORS]], dtype=float)
+        risks = self.calculate_risk_matrix(indicators)
+        individual_risks = {component: float(risks[0, j]) for j, component in enumerate(RISK_COMPONENTS)}
+        overall_risk = float(self.calculate_overall_risk_batch(risks)[0])
         
         metrics = [
             RiskMetric(
@@ -427,8 +684,22 @@ class AgriculturalRiskCalculator:
         
         return metrics
 
+_calculator_instance = None
+_calculator_lock = threading.Lock()
+
+def get_risk_calculator() -> AgriculturalRiskCalculator:
+    global _calculator_instance
+    with _calculator_lock:
+        if _calculator_instance is None:
+            _calculator_instance = AgriculturalRiskCalculator()
+            warmup = os.getenv("RISK_WARMUP_COMMODITIES", "").strip()
+            if warmup:
+                commodities = [c.strip() for c in warmup.split(",") if c.strip()]
+                _calculator_instance.data_fetcher.start_warmup(commodities or None)
+    return _calculator_instance
+
 def get_agricultural_risk_metrics(primary_commodity: str) -> Dict:
-    calculator = AgriculturalRiskCalculator()
+    calculator = get_risk_calculator()
     
     try:
         risk_metrics = calculator.calculate_risk_metrics(primary_commodity)
@@ -455,6 +726,62 @@ def get_agricultural_risk_metrics(primary_commodity: str) -> Dict:
             "timestamp": datetime.now().isoformat()
         }
 
+def get_portfolio_risk_metrics(commodities: List[str], exposures: Optional[List[float]] = None,
+                               regions: Optional[List[str]] = None) -> Dict:
+    calculator = get_risk_calculator()
+    
+    try:
+        # Loan book lines for the same commodity and region are one position
+        positions: Dict[tuple, Dict] = {}
+        for i, commodity in enumerate(commodities):
+            region = regions[i] if regions and i < len(regions) and regions[i] else None
+            exposure = float(exposures[i]) if exposures and i < len(exposures) else 1.0
+            key = position_key(commodity, region)
+            if key in positions:
+                positions[key]["exposure"] += exposure
+            else:
+                positions[key] = {"commodity": commodity, "region": region, "exposure": exposure}
+        if not positions:
+            raise ValueError("At least one commodity is required")
+        positions = list(positions.values())
+        
+        result = calculator.calculate_portfolio_risk(positions)
+        
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            **result
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error", 
+            "message": f"Error: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
+def get_risk_scenario_simulation(primary_commodity: str, n_paths: int = 100000, shock_scale: float = 1.0) -> Dict:
+    calculator = get_risk_calculator()
+    
+    try:
+        n_paths = max(1000, min(int(n_paths), 2_000_000))
+        processes = int(os.getenv("RISK_SIMULATION_PROCESSES", 1)) if n_paths > 500_000 else 1
+        result = calculator.simulate_scenarios(primary_commodity, n_paths=n_paths,
+                                               shock_scale=shock_scale, processes=processes)
+        
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            **result
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error", 
+            "message": f"Error: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
 if __name__ == "__main__":
     commodity = "wheat"
     result = get_agricultural_risk_metrics(commodity)
@@ -1,38 +1,58 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from market_inform_policy_capture import MarketInformPolicyCapture
-from web_scrapper import scrape_agri_prices, scrape_policy_updates, scrape_links
+from fastapi import APIRouter, UploadFile, File, Form, BackgroundTasks
+from fastapi.responses import FileResponse, StreamingResponse
+from market_inform_policy_capture import get_market_intelligence_refresher
+from web_scrapper import scrape_agri_prices, export_agri_prices, scrape_policy_updates, scrape_links, MAX_TABLE_ROWS
 from translation_tool import MultiLanguageTranslator
-from risk_management import get_agricultural_risk_metrics
+from risk_management import get_agricultural_risk_metrics, get_portfolio_risk_metrics, get_risk_scenario_simulation
 from pest_prediction import detect_pests
 from getCropYield import crop_yield_inference
 from getCropRecommendation import get_crop_recommendation
 from fetchWeatherForecast import get_google_weather_forecast
 from fetchMarketPrice import fetch_market_price
+from mandi_price_analytics import analyze_mandi_arbitrage
 from fertilizer_inference import FertilizerRecommendationInference
 from crop_disease_detection import detect_crop_disease
+import os
 import tempfile
 
 router = APIRouter()
 
-market_capture_tool = MarketInformPolicyCapture()
+market_intelligence_refresher = get_market_intelligence_refresher()
 translator = MultiLanguageTranslator()
 
 @router.get("/api/v1/creditpolicy/comprehensive-analysis")
-async def comprehensive_analysis():
+def comprehensive_analysis(force_refresh: bool = False):
     try:
-        result = market_capture_tool.run_comprehensive_analysis()
-        return {"success": True, "result": str(result)}
+        result = market_intelligence_refresher.run_comprehensive_analysis(force_refresh)
+        return {
+            "success": True,
+            "result": str(result),
+            "version": result.version,
+            "generated_at": result.generated_at.isoformat() if result.generated_at else None,
+            "staleness": result.staleness
+        }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 @router.post("/api/v1/webscrapper/agri-prices")
-async def agri_prices(url: str, table_selector: str = "table"):
+def agri_prices(url: str, table_selector: str = "table", max_rows: int = MAX_TABLE_ROWS):
     try:
-        data = scrape_agri_prices(url, table_selector)
-        return {"success": True, "data": data}
+        data = scrape_agri_prices(url, table_selector, max_rows)
+        return {"success": True, "data": data, "truncated": len(data) >= max_rows}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@router.post("/api/v1/webscrapper/agri-prices/export")
+def agri_prices_export(background_tasks: BackgroundTasks, url: str, table_selector: str = "table", file_format: str = "csv"):
+    with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as handle:
+        output_path = handle.name
+    background_tasks.add_task(os.remove, output_path)
+    try:
+        export_agri_prices(url, output_path, table_selector, file_format)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    return FileResponse(output_path, filename=f"agri_prices.{file_format}")
+
 @router.post("/api/v1/webscrapper/policy-updates")
 async def policy_updates(url: str, selector: str = ".policy-update"):
     try:
@@ -57,9 +77,17 @@ async def translate_text(text: str, source_lang: str = "auto", target_lang: str
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@router.post("/api/v1/translate/stream")
+async def translate_stream(text: str, source_lang: str = "auto", target_lang: str = "en"):
+    return StreamingResponse(translator.translate_stream(text, source_lang, target_lang),
+                             media_type="text/plain; charset=utf-8")
+
 @router.post("/api/v1/translate/batch")
-async def batch_translate(texts: list, source_lang: str = "auto", target_lang: str = "en"):
+async def batch_translate(texts: list, source_lang: str = "auto", target_lang: str = "en", target_langs: list = None):
     try:
+        if target_langs:
+            results = translator.batch_translate_languages(texts, source_lang, target_langs)
+            return {"success": True, "results": results}
         results = translator.batch_translate(texts, source_lang, target_lang)
         return {"success": True, "results": results}
     except Exception as e:
@@ -73,6 +101,22 @@ async def agricultural_risk(primary_commodity: str):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@router.post("/api/v1/riskmanagement/portfolio-risk")
+def portfolio_risk(commodities: list, exposures: list = None, regions: list = None):
+    try:
+        result = get_portfolio_risk_metrics(commodities, exposures, regions)
+        return result
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+@router.post("/api/v1/riskmanagement/scenario-simulation")
+def scenario_simulation(primary_commodity: str, n_paths: int = 100000, shock_scale: float = 1.0):
+    try:
+        result = get_risk_scenario_simulation(primary_commodity, n_paths, shock_scale)
+        return result
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 @router.post("/api/v1/pest-prediction")
 async def pest_prediction(file: UploadFile = File(...)):
     try:
@@ -160,6 +204,14 @@ async def market_price(state_name: str = "Karnataka"):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@router.post("/api/v1/market-price/arbitrage")
+def market_price_arbitrage(state_name: str = "Karnataka", commodity: str = None, top_n: int = 10):
+    try:
+        result = analyze_mandi_arbitrage(state_name, commodity, top_n)
+        return result
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 @router.post("/api/v1/fertilizer/recommendation")
 async def fertilizer_recommendation(
     temperature: float,
@@ -0,0 +1,122 @@
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('TRANSLATION_MEMORY_DB', os.path.join(PROJECT_ROOT, 'cache', 'translation_memory.db'))
+
+# Runs of spaces and tabs collapse, but line breaks are kept since translations preserve them
+_WHITESPACE = re.compile(r'[^\S\n]+')
+_LINE_EDGES = re.compile(r' ?\n ?')
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n')
+    return _LINE_EDGES.sub('\n', _WHITESPACE.sub(' ', text)).strip()
+
+class TranslationMemory:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_entries: int = 10000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._db_lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    method TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (source_lang, target_lang, text_hash)
+                )
+            """)
+
+    def _key(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str, str]:
+        digest = hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+        return source_lang.lower(), target_lang.lower(), digest
+
+    def _remember(self, key: Tuple[str, str, str], value: Tuple[str, str]):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[Tuple[str, str]]:
+        key = self._key(text, source_lang, target_lang)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT translated_text, method FROM translations
+                WHERE source_lang = ? AND target_lang = ? AND text_hash = ?
+            """, key).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        value = (row[0], row[1])
+        self._remember(key, value)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, text: str, source_lang: str, target_lang: str, translated_text: str, method: str):
+        key = self._key(text, source_lang, target_lang)
+        self._remember(key, (translated_text, method))
+        with self._db_lock, self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO translations
+                    (source_lang, target_lang, text_hash, source_text, translated_text, method, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, key + (normalize_text(text), translated_text, method, time.time()))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries_in_memory": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+_memory_instance = None
+_memory_lock = threading.Lock()
+
+def get_translation_memory() -> TranslationMemory:
+    global _memory_instance
+    with _memory_lock:
+        if _memory_instance is None:
+            _memory_instance = TranslationMemory(max_entries=int(os.getenv("TRANSLATION_MEMORY_SIZE", 10000)))
+    return _memory_instance
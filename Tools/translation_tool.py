@@ -1,14 +1,96 @@
+import re
 import json
 import logging
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from deep_translator import GoogleTranslator
 import httpx
 
+try:
+    from Tools.translation_memory import get_translation_memory
+except ImportError:
+    from translation_memory import get_translation_memory
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FALLBACK_URL = "https://translate.googleapis.com/translate_a/single"
+MAX_REQUEST_CHARS = 4500
+PACK_SEPARATOR = "\n"
+
+MARKDOWN_PREFIX = re.compile(r'^(\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s*)*)')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?\u0964\u0965])(\s+)')
+
+def split_translation_units(text: str, max_chars: int = MAX_REQUEST_CHARS) -> List[Tuple[bool, str]]:
+    """Split text into (translatable, piece) units on line, markdown and sentence boundaries."""
+    units = []
+    in_code = False
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip('\r\n')
+        ending = line[len(body):]
+        
+        if body.lstrip().startswith('```'):
+            in_code = not in_code
+            units.append((False, line))
+            continue
+        if in_code or not body.strip():
+            units.append((False, line))
+            continue
+        
+        prefix = MARKDOWN_PREFIX.match(body).group(1)
+        content = body[len(prefix):]
+        trailing = content[len(content.rstrip()):]
+        content = content.rstrip()
+        if prefix:
+            units.append((False, prefix))
+        
+        for i, piece in enumerate(SENTENCE_BREAK.split(content)):
+            if i % 2:
+                units.append((False, piece))
+                continue
+            while len(piece) > max_chars:
+                cut = piece.rfind(' ', 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                units.append((True, piece[:cut]))
+                units.append((False, piece[cut:len(piece) - len(piece[cut:].lstrip())]))
+                piece = piece[cut:].lstrip()
+            if piece:
+                units.append((True, piece))
+        
+        if trailing + ending:
+            units.append((False, trailing + ending))
+    return units
+
+_translators = threading.local()
+_client_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+
+def get_google_translator(source_lang: str, target_lang: str) -> GoogleTranslator:
+    # GoogleTranslator keeps request params on the instance, so reuse is per thread
+    pool = getattr(_translators, 'pool', None)
+    if pool is None:
+        pool = _translators.pool = {}
+    translator = pool.get((source_lang, target_lang))
+    if translator is None:
+        translator = pool[(source_lang, target_lang)] = GoogleTranslator(source=source_lang, target=target_lang)
+    return translator
+
+def get_http_client() -> httpx.Client:
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+    return _http_client
+
 class MultiLanguageTranslator:
-    def __init__(self):
+    def __init__(self, use_memory: bool = True, max_workers: int = 8, max_chars: int = MAX_REQUEST_CHARS):
+        self.memory = get_translation_memory() if use_memory else None
+        self.max_workers = max_workers
+        self.max_chars = max_chars
         self.supported_languages = {
             'auto': 'Auto-detect',
             'en': 'English',
@@ -107,60 +189,63 @@ class MultiLanguageTranslator:
                 "supported_languages": list(self.supported_languages.keys())
             }
         
+        if len(text) > self.max_chars:
+            return self.translate_document(text, source_lang, target_lang)
+        
+        if self.memory is not None and text.strip():
+            cached = self.memory.get(text, source_lang, target_lang)
+            if cached is not None:
+                return self._result(text, cached[0], source_lang, target_lang, cached[1], cached=True)
+        
         try:
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            translated = translator.translate(text)
+            translated, method = self._translate_uncached(text, source_lang, target_lang)
+        except Exception as fallback_error:
+            logger.error(f"All translation methods failed: {fallback_error}")
             
             return {
                 "original_text": text,
-                "translated_text": translated,
+                "translated_text": f"Translation failed: {text}",
                 "source_language": self.supported_languages.get(source_lang, source_lang),
                 "target_language": self.supported_languages.get(target_lang, target_lang),
-                "status": "success",
-                "method": "deep_translator"
+                "status": "error",
+                "error": str(fallback_error),
+                "method": "error_fallback"
             }
-            
+        
+        if self.memory is not None and translated and text.strip():
+            self.memory.put(text, source_lang, target_lang, translated, method)
+        return self._result(text, translated, source_lang, target_lang, method)
+    
+    def _result(self, text: str, translated: str, source_lang: str, target_lang: str,
+                method: str, cached: bool = False) -> Dict:
+        return {
+            "original_text": text,
+            "translated_text": translated,
+            "source_language": self.supported_languages.get(source_lang, source_lang),
+            "target_language": self.supported_languages.get(target_lang, target_lang),
+            "status": "success",
+            "method": method,
+            "cached": cached
+        }
+    
+    def _translate_uncached(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        try:
+            return get_google_translator(source_lang, target_lang).translate(text), "deep_translator"
         except Exception as e:
             logger.warning(f"deep-translator failed: {e}, trying httpx fallback")
-            
-            try:
-                url = "https://translate.googleapis.com/translate_a/single"
-                params = {
-                    "client": "gtx",
-                    "sl": source_lang,
-                    "tl": target_lang,
-                    "dt": "t",
-                    "q": text
-                }
-                
-                with httpx.Client(timeout=10.0) as client:
-                    response = client.get(url, params=params)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    translated_text = ''.join([sentence[0] for sentence in data[0]])
-                    
-                    return {
-                        "original_text": text,
-                        "translated_text": translated_text,
-                        "source_language": self.supported_languages.get(source_lang, source_lang),
-                        "target_language": self.supported_languages.get(target_lang, target_lang),
-                        "status": "success",
-                        "method": "httpx_fallback"
-                    }
-                    
-            except Exception as fallback_error:
-                logger.error(f"All translation methods failed: {fallback_error}")
-                
-                return {
-                    "original_text": text,
-                    "translated_text": f"Translation failed: {text}",
-                    "source_language": self.supported_languages.get(source_lang, source_lang),
-                    "target_language": self.supported_languages.get(target_lang, target_lang),
-                    "status": "error",
-                    "error": str(fallback_error),
-                    "method": "error_fallback"
-                }
+        
+        params = {
+            "client": "gtx",
+            "sl": source_lang,
+            "tl": target_lang,
+            "dt": "t",
+            "q": text
+        }
+        response = get_http_client().get(FALLBACK_URL, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        return ''.join([sentence[0] for sentence in data[0]]), "httpx_fallback"
     
     def translate_file(self, file_path: str, source_lang: str = 'auto', target_lang: str = 'te') -> Dict:
         try:
@@ -184,17 +269,196 @@ class MultiLanguageTranslator:
             }
     
     def batch_translate(self, texts: List[str], source_lang: str = 'auto', target_lang: str = 'te') -> List[Dict]:
-        results = []
-        for i, text in enumerate(texts):
-            print(f"Translating {i+1}/{len(texts)}...")
-            result = self.translate_robust(text, source_lang, target_lang)
-            results.append(result)
+        return self.batch_translate_languages(texts, source_lang, [target_lang])[target_lang]
+    
+    def batch_translate_languages(self, texts: List[str], source_lang: str = 'auto',
+                                  target_langs: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        target_langs = list(dict.fromkeys(target_langs or ['te']))
+        translations: Dict[Tuple[str, str], Tuple[str, str, bool]] = {}
+        errors: Dict[Tuple[str, str], str] = {}
+        packs = []
+        
+        for target_lang in target_langs:
+            if target_lang not in self.supported_languages:
+                continue
+            
+            pending = []
+            for text in dict.fromkeys(text for text in texts if text and text.strip()):
+                cached = self.memory.get(text, source_lang, target_lang) if self.memory is not None else None
+                if cached is not None:
+                    translations[(target_lang, text)] = (cached[0], cached[1], True)
+                else:
+                    pending.append(text)
+            packs.extend((target_lang, pack) for pack in self._pack_segments(pending))
+        
+        if packs:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(packs))) as executor:
+                outcomes = executor.map(lambda job: self._translate_pack(job[1], source_lang, job[0]), packs)
+                for (target_lang, pack), outcome in zip(packs, outcomes):
+                    for text, (translated, method, error) in zip(pack, outcome):
+                        if error:
+                            errors[(target_lang, text)] = error
+                        else:
+                            translations[(target_lang, text)] = (translated, method, False)
+        
+        results = {}
+        for target_lang in target_langs:
+            if target_lang not in self.supported_languages:
+                error = {
+                    "error": f"Unsupported target language: {target_lang}",
+                    "supported_languages": list(self.supported_languages.keys())
+                }
+                results[target_lang] = [dict(error, index=i) for i in range(len(texts))]
+                continue
+            
+            items = []
+            for i, text in enumerate(texts):
+                if not text or not text.strip():
+                    item = self._result(text or "", text or "", source_lang, target_lang, "passthrough")
+                elif (target_lang, text) in translations:
+                    translated, method, cached = translations[(target_lang, text)]
+                    item = self._result(text, translated, source_lang, target_lang, method, cached=cached)
+                else:
+                    item = {
+                        "original_text": text,
+                        "translated_text": f"Translation failed: {text}",
+                        "source_language": self.supported_languages.get(source_lang, source_lang),
+                        "target_language": self.supported_languages.get(target_lang, target_lang),
+                        "status": "error",
+                        "error": errors.get((target_lang, text), "Unknown error"),
+                        "method": "error_fallback"
+                    }
+                item["index"] = i
+                items.append(item)
+            results[target_lang] = items
+        
         return results
     
+    def _pack_segments(self, segments: List[str]) -> List[List[str]]:
+        packs, current, size = [], [], 0
+        for segment in segments:
+            if PACK_SEPARATOR in segment or len(segment) > self.max_chars:
+                packs.append([segment])
+                continue
+            if current and size + len(segment) + len(PACK_SEPARATOR) > self.max_chars:
+                packs.append(current)
+                current, size = [], 0
+            current.append(segment)
+            size += len(segment) + len(PACK_SEPARATOR)
+        if current:
+            packs.append(current)
+        return packs
+    
+    def _translate_pack(self, pack: List[str], source_lang: str, target_lang: str) -> List[Tuple[str, str, Optional[str]]]:
+        if len(pack) > 1:
+            try:
+                translated, method = self._translate_uncached(PACK_SEPARATOR.join(pack), source_lang, target_lang)
+                parts = translated.split(PACK_SEPARATOR) if translated else []
+                if len(parts) == len(pack):
+                    outcome = [(part.strip(), method, None) for part in parts]
+                    self._store(pack, outcome, source_lang, target_lang)
+                    return outcome
+                logger.warning(f"Packed translation returned {len(parts)} segments for {len(pack)}, retrying individually")
+            except Exception as e:
+                logger.warning(f"Packed translation failed: {e}, retrying individually")
+        
+        outcome = []
+        for text in pack:
+            if len(text) > self.max_chars:
+                result = self.translate_document(text, source_lang, target_lang)
+                if result["status"] == "success":
+                    outcome.append((result["translated_text"], result["method"], None))
+                else:
+                    outcome.append((None, "error_fallback", result.get("error", "Chunked translation failed")))
+                continue
+            try:
+                translated, method = self._translate_uncached(text, source_lang, target_lang)
+                outcome.append((translated, method, None))
+            except Exception as e:
+                outcome.append((None, "error_fallback", str(e)))
+        self._store(pack, outcome, source_lang, target_lang)
+        return outcome
+    
+    def _store(self, pack: List[str], outcome: List[Tuple[str, str, Optional[str]]], source_lang: str, target_lang: str):
+        if self.memory is None:
+            return
+        for text, (translated, method, error) in zip(pack, outcome):
+            if not error and translated:
+                self.memory.put(text, source_lang, target_lang, translated, method)
+    
+    def translate_document(self, text: str, source_lang: str = 'auto', target_lang: str = 'te') -> Dict:
+        units = split_translation_units(text, self.max_chars)
+        segments = [piece for translatable, piece in units if translatable]
+        items = iter(self.batch_translate(segments, source_lang, target_lang))
+        
+        pieces, failed = [], []
+        for translatable, piece in units:
+            if not translatable:
+                pieces.append(piece)
+                continue
+            item = next(items)
+            if item.get("status") == "success":
+                pieces.append(item["translated_text"])
+            else:
+                pieces.append(piece)
+                failed.append(item.get("error", "Unknown error"))
+        
+        if failed and len(failed) == len(segments):
+            return {
+                "original_text": text,
+                "translated_text": f"Translation failed: {text}",
+                "source_language": self.supported_languages.get(source_lang, source_lang),
+                "target_language": self.supported_languages.get(target_lang, target_lang),
+                "status": "error",
+                "error": failed[0],
+                "method": "error_fallback"
+            }
+        
+        result = self._result(text, ''.join(pieces), source_lang, target_lang, "chunked")
+        result["chunks"] = len(segments)
+        if failed:
+            result["status"] = "partial"
+            result["failed_chunks"] = len(failed)
+        return result
+    
+    def translate_stream(self, text: str, source_lang: str = 'auto', target_lang: str = 'te') -> Iterator[str]:
+        units = split_translation_units(text, self.max_chars)
+        
+        chunks, current, size = [], [], 0
+        for translatable, piece in units:
+            if translatable and current and size + len(piece) > self.max_chars:
+                chunks.append(current)
+                current, size = [], 0
+            current.append((translatable, piece))
+            size += len(piece) + len(PACK_SEPARATOR) if translatable else 0
+        if current:
+            chunks.append(current)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._translate_chunk, chunk, source_lang, target_lang) for chunk in chunks]
+            for future in futures:
+                yield future.result()
+    
+    def _translate_chunk(self, chunk: List[Tuple[bool, str]], source_lang: str, target_lang: str) -> str:
+        segments = list(dict.fromkeys(piece for translatable, piece in chunk if translatable))
+        translated = {}
+        pending = []
+        for segment in segments:
+            cached = self.memory.get(segment, source_lang, target_lang) if self.memory is not None else None
+            if cached is not None:
+                translated[segment] = cached[0]
+            else:
+                pending.append(segment)
+        
+        if pending:
+            for segment, (text, _, error) in zip(pending, self._translate_pack(pending, source_lang, target_lang)):
+                translated[segment] = segment if error else text
+        
+        return ''.join(translated[piece] if translatable else piece for translatable, piece in chunk)
+    
     def detect_language(self, text: str) -> Dict:
         try:
-            translator = GoogleTranslator(source='auto', target='en')
-            detected = translator.translate(text)
+            detected = get_google_translator('auto', 'en').translate(text)
             
             return {
                 "text": text,
@@ -1,72 +1,448 @@
 import os
+import re
+import csv
 import time
-from typing import List, Dict, Any
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from bs4 import BeautifulSoup
+from lxml import etree
 
-class WebScrapper:
-    def __init__(self, headless: bool = True):
+try:
+    from Tools.page_cache import get_page_cache
+except ImportError:
+    from page_cache import get_page_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9"
+}
+
+# Caps on what one agent or API call returns and on what the parse cache stores as a single blob
+MAX_TABLE_ROWS = int(os.getenv("SCRAPER_MAX_TABLE_ROWS", 1000))
+PARSE_CACHE_MAX_ITEMS = int(os.getenv("SCRAPER_PARSE_CACHE_MAX_ITEMS", 5000))
+
+SIMPLE_SELECTOR = re.compile(r'^([A-Za-z][\w-]*)?(?:#([\w-]+))?((?:\.[\w-]+)*)$')
+NUMBER = re.compile(r'^(?:₹|Rs\.?|INR)?\s*(-?[\d,]*\.?\d+)$')
+
+def parse_simple_selector(selector: str) -> Optional[Tuple[Optional[str], Optional[str], set]]:
+    match = SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    tag, element_id, classes = match.groups()
+    return (tag.lower() if tag else None), element_id, set(filter(None, classes.split('.')))
+
+def _matches(element, selector: Tuple[Optional[str], Optional[str], set]) -> bool:
+    tag, element_id, classes = selector
+    if not isinstance(element.tag, str):
+        return False
+    if tag and element.tag.lower() != tag:
+        return False
+    if element_id and element.get('id') != element_id:
+        return False
+    return not classes or classes.issubset((element.get('class') or '').split())
+
+def convert_cell(value: str) -> Any:
+    match = NUMBER.match(value)
+    if not match:
+        return value
+    number = match.group(1).replace(',', '')
+    try:
+        return float(number) if '.' in number else int(number)
+    except ValueError:
+        return value
+
+class _EncodedReader:
+    """File-like view that encodes the HTML string a slice at a time instead of holding a full byte copy."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        # A UTF-8 character is at most 4 bytes, so the slice never overflows the requested size
+        end = len(self.text) if size is None or size < 0 else self.position + max(1, size // 4)
+        chunk = self.text[self.position:end]
+        self.position += len(chunk)
+        return chunk.encode('utf-8')
+
+def _iterparse(html: str):
+    return etree.iterparse(_EncodedReader(html), events=("start", "end"), html=True, recover=True, encoding="utf-8")
+
+def iter_html_table_rows(html: str, table_selector: str = "table") -> Iterator[List[str]]:
+    """Stream the rows of the first element matching a simple selector, clearing parsed nodes as it goes.
+
+    The parse tree stays small, but the HTML string itself is still held in memory by the caller.
+    """
+    selector = parse_simple_selector(table_selector)
+    if selector is None:
+        table = BeautifulSoup(html, "lxml").select_one(table_selector)
+        for tr in table.find_all("tr") if table else []:
+            cells = [td.get_text(strip=True) for td in tr.find_all(["td", "th"])]
+            if cells:
+                yield cells
+        return
+
+    target = None
+    for event, element in _iterparse(html):
+        if event == "start":
+            if target is None and _matches(element, selector):
+                target = element
+            continue
+
+        if target is None:
+            if element.getparent() is not None and element.tag not in ("html", "body"):
+                element.clear()
+            continue
+
+        if element is target:
+            break
+        if element.tag == "tr":
+            cells = ["".join(text.strip() for text in cell.itertext())
+                     for cell in element.iter("td", "th")]
+            if cells:
+                yield cells
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+def _has_text(value: Optional[str]) -> bool:
+    return bool(value and value.strip())
+
+def html_has_match(html: str, selector: str) -> bool:
+    """True when an element matching the selector carries table rows or text, not just an empty skeleton."""
+    simple = parse_simple_selector(selector)
+    if simple is None:
+        return any(el.find("tr") or el.get_text(strip=True) for el in BeautifulSoup(html, "lxml").select(selector))
+
+    target = None
+    for event, element in _iterparse(html):
+        if event == "start":
+            if target is None and _matches(element, simple):
+                target = element
+            continue
+
+        if element is target:
+            if _has_text(element.text):
+                return True
+            target = None
+        elif target is not None and (element.tag == "tr" or _has_text(element.text) or _has_text(element.tail)):
+            return True
+        if element.getparent() is not None:
+            element.clear()
+    return False
+
+class BrowserPool:
+    def __init__(self, size: int = 3, max_pages: int = 50, headless: bool = True, lease_timeout: float = 60.0):
+        self.size = size
+        self.max_pages = max_pages
+        self.headless = headless
+        self.lease_timeout = lease_timeout
+        self._idle: List[webdriver.Chrome] = []
+        self._pages: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Signalled whenever a driver goes back to the pool or is retired, so waiters can reuse or replace it
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+
+    def _new_driver(self) -> webdriver.Chrome:
         chrome_options = Options()
-        if headless:
+        if self.headless:
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--window-size=1920,1080")
-        self.driver = webdriver.Chrome(options=chrome_options)
+        chrome_options.page_load_strategy = "eager"
+        return webdriver.Chrome(options=chrome_options)
+
+    def _acquire(self) -> webdriver.Chrome:
+        deadline = time.monotonic() + self.lease_timeout
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser available within {self.lease_timeout}s")
+                self._available.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            driver = self._new_driver()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _release(self, driver: webdriver.Chrome):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
 
-    def fetch_page(self, url: str, wait_time: int = 3) -> str:
-        self.driver.get(url)
-        time.sleep(wait_time)
-        return self.driver.page_source
+    def _retire(self, driver: webdriver.Chrome):
+        with self._available:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Browser quit failed: {e}")
+
+    @contextmanager
+    def lease(self):
+        driver = self._acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            with self._lock:
+                served = self._pages.get(id(driver), 0) + 1
+                self._pages[id(driver)] = served
+            if not healthy or served >= self.max_pages:
+                self._retire(driver)
+            else:
+                self._release(driver)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._retire(driver)
+
+_pool_instance = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = BrowserPool(
+                size=int(os.getenv("SCRAPER_BROWSER_POOL_SIZE", 3)),
+                max_pages=int(os.getenv("SCRAPER_BROWSER_MAX_PAGES", 50))
+            )
+            atexit.register(_pool_instance.close)
+    return _pool_instance
+
+class StaticFetcher:
+    def __init__(self, timeout: int = 15, pool_size: int = 10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(STATIC_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Tuple[int, Optional[str], Dict[str, str]]:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return response.status_code, None, validators
+        return response.status_code, response.text, validators
+
+class DomainTierMemory:
+    def __init__(self, reprobe_after: int = 24 * 3600):
+        self.reprobe_after = reprobe_after
+        self._tiers: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._tiers.get(urlparse(url).netloc)
+        if entry is None:
+            return None
+        tier, learned_at = entry
+        if tier == "browser" and time.time() - learned_at > self.reprobe_after:
+            return None
+        return tier
+
+    def set(self, url: str, tier: str):
+        with self._lock:
+            self._tiers[urlparse(url).netloc] = (tier, time.time())
+
+_static_fetcher = StaticFetcher()
+_domain_tiers = DomainTierMemory()
+
+class WebScrapper:
+    def __init__(self, headless: bool = True, pool: Optional[BrowserPool] = None):
+        self.pool = pool or (get_browser_pool() if headless else BrowserPool(size=1, headless=False))
+        self.static = _static_fetcher
+        self.tiers = _domain_tiers
+        self.cache = get_page_cache()
+
+    def fetch_page(self, url: str, wait_selector: Optional[str] = None, wait_time: int = 10) -> str:
+        with self.pool.lease() as driver:
+            driver.get(url)
+            try:
+                if wait_selector:
+                    WebDriverWait(driver, wait_time).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                    )
+                else:
+                    WebDriverWait(driver, wait_time).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete"
+                    )
+            except TimeoutException:
+                logger.warning(f"Timed out waiting for {wait_selector or 'page load'} on {url}")
+            return driver.page_source
+
+    def load_page(self, url: str, selector: str) -> Tuple[str, Optional[str]]:
+        # Pages are cached per URL, so a body stored for one selector must still pass this one
+        cached = self.cache.get_page(url)
+        if cached and not html_has_match(cached.body, selector):
+            cached = None
+        if cached and cached.fresh:
+            return cached.body, cached.body_hash
+
+        if self.tiers.get(url) != "browser":
+            try:
+                conditional = cached if cached and cached.tier == "static" else None
+                status, html, validators = self.static.fetch(
+                    url,
+                    conditional.etag if conditional else None,
+                    conditional.last_modified if conditional else None
+                )
+                if status == 304 and conditional:
+                    self.cache.touch(url)
+                    return conditional.body, conditional.body_hash
+                if html and html_has_match(html, selector):
+                    self.tiers.set(url, "static")
+                    body_hash = self.cache.put_page(url, html, "static", validators["etag"], validators["last_modified"])
+                    return html, body_hash
+            except requests.RequestException as e:
+                logger.info(f"Static fetch failed for {url}: {e}")
+            logger.info(f"Escalating {urlparse(url).netloc} to headless browser for '{selector}'")
+
+        html = self.fetch_page(url, selector)
+        if not html_has_match(html, selector):
+            return html, None
+        self.tiers.set(url, "browser")
+        return html, self.cache.put_page(url, html, "browser")
+
+    def fetch_document(self, url: str, selector: str) -> BeautifulSoup:
+        html, _ = self.load_page(url, selector)
+        return BeautifulSoup(html, "lxml")
+
+    def _extract(self, url: str, selector: str, kind: str, parse: Callable[[str], Any]) -> Any:
+        html, body_hash = self.load_page(url, selector)
+        if body_hash:
+            cached = self.cache.get_parse(url, selector, kind, body_hash)
+            if cached is not None:
+                return cached
+
+        result = parse(html)
+        if body_hash and len(result) <= PARSE_CACHE_MAX_ITEMS:
+            self.cache.put_parse(url, selector, kind, body_hash, result)
+        return result
 
     def extract_table(self, url: str, table_selector: str = "table") -> List[List[str]]:
-        html = self.fetch_page(url)
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.select_one(table_selector)
-        rows = []
-        if table:
-            for tr in table.find_all("tr"):
-                cells = [td.get_text(strip=True) for td in tr.find_all(["td", "th"])]
-                if cells:
-                    rows.append(cells)
-        return rows
+        return self._extract(url, table_selector, "table",
+                             lambda html: list(iter_html_table_rows(html, table_selector)))
+
+    def iter_table_records(self, url: str, table_selector: str = "table", typed: bool = True) -> Iterator[Dict[str, Any]]:
+        html, _ = self.load_page(url, table_selector)
+        rows = iter_html_table_rows(html, table_selector)
+        headers = next(rows, [])
+        for row in rows:
+            yield {
+                headers[i]: convert_cell(row[i]) if typed else row[i]
+                for i in range(min(len(headers), len(row)))
+            }
+
+    def export_table(self, url: str, output_path: str, table_selector: str = "table",
+                     file_format: str = "csv", batch_size: int = 5000) -> Dict[str, Any]:
+        html, _ = self.load_page(url, table_selector)
+        rows = iter_html_table_rows(html, table_selector)
+        headers = next(rows, [])
+        written = 0
+
+        if file_format == "csv":
+            with open(output_path, "w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(headers)
+                for row in rows:
+                    writer.writerow(row[:len(headers)])
+                    written += 1
+        elif file_format == "parquet":
+            if pq is None:
+                raise ImportError("pyarrow is required for parquet export")
+            schema = pa.schema([(name, pa.string()) for name in headers])
+            with pq.ParquetWriter(output_path, schema) as writer:
+                batch = []
+                for row in rows:
+                    batch.append(row[:len(headers)] + [None] * (len(headers) - len(row)))
+                    if len(batch) >= batch_size:
+                        writer.write_table(pa.Table.from_pylist([dict(zip(headers, r)) for r in batch], schema))
+                        written += len(batch)
+                        batch = []
+                if batch:
+                    writer.write_table(pa.Table.from_pylist([dict(zip(headers, r)) for r in batch], schema))
+                    written += len(batch)
+        else:
+            raise ValueError(f"Unsupported export format: {file_format}")
+
+        return {"output_path": output_path, "columns": headers, "rows": written, "format": file_format}
 
     def extract_text(self, url: str, selector: str) -> List[str]:
-        html = self.fetch_page(url)
-        soup = BeautifulSoup(html, "html.parser")
-        elements = soup.select(selector)
-        return [el.get_text(strip=True) for el in elements]
+        return self._extract(url, selector, "text",
+                             lambda html: [el.get_text(strip=True) for el in BeautifulSoup(html, "lxml").select(selector)])
 
     def extract_links(self, url: str, selector: str = "a") -> List[str]:
-        html = self.fetch_page(url)
-        soup = BeautifulSoup(html, "html.parser")
-        elements = soup.select(selector)
-        return [el.get("href") for el in elements if el.get("href")]
+        return self._extract(url, selector, "links",
+                             lambda html: [el.get("href") for el in BeautifulSoup(html, "lxml").select(selector) if el.get("href")])
 
     def close(self):
-        self.driver.quit()
+        if self.pool is not _pool_instance:
+            self.pool.close()
+
+def scrape_agri_prices(url: str, table_selector: str = "table", max_rows: int = MAX_TABLE_ROWS) -> List[Dict[str, Any]]:
+    scrapper = WebScrapper()
+    return list(islice(scrapper.iter_table_records(url, table_selector, typed=False), max_rows))
 
-def scrape_agri_prices(url: str, table_selector: str = "table") -> List[Dict[str, Any]]:
+def export_agri_prices(url: str, output_path: str, table_selector: str = "table", file_format: str = "csv") -> Dict[str, Any]:
     scrapper = WebScrapper()
-    rows = scrapper.extract_table(url, table_selector)
-    headers = rows[0] if rows else []
-    data = []
-    for row in rows[1:]:
-        item = {headers[i]: row[i] for i in range(min(len(headers), len(row)))}
-        data.append(item)
-    scrapper.close()
-    return data
+    return scrapper.export_table(url, output_path, table_selector, file_format)
 
 def scrape_policy_updates(url: str, selector: str = ".policy-update") -> List[str]:
     scrapper = WebScrapper()
-    updates = scrapper.extract_text(url, selector)
-    scrapper.close()
-    return updates
+    return scrapper.extract_text(url, selector)
 
 def scrape_links(url: str, selector: str = "a") -> List[str]:
     scrapper = WebScrapper()
-    links = scrapper.extract_links(url, selector)
-    scrapper.close()
-    return links
+    return scrapper.extract_links(url, selector)